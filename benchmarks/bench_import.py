@@ -0,0 +1,125 @@
+"""
+Benchmarks how long it takes to import Noire.
+
+Each statement is run in a fresh interpreter so that nothing is already
+cached in `sys.modules`. We report the minimum and median wall time over
+several interpreters (excluding interpreter start-up), and which heavy
+dependencies each statement loaded.
+
+Usage:
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --repeat 20 --json results.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+STATEMENTS = [
+    "import noire",
+    "from noire import Noire",
+    "from noire import AsyncNoire",
+    "from noire import NoireFleet",
+]
+
+# Dependencies that only some of Noire's operations need.
+HEAVY_MODULES = ["bs4", "pydantic", "lxml"]
+
+_TIMER = """
+import sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(elapsed, ",".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def time_statement(statement: str) -> Dict[str, Any]:
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            _TIMER.format(statement=statement, heavy=HEAVY_MODULES),
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    elapsed, loaded = completed.stdout.split(" ")
+    return {
+        "seconds": float(elapsed),
+        "loaded": [name for name in loaded.strip().split(",") if name],
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--repeat", type=int, default=10, help="Interpreters per statement."
+    )
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        help="Fail if the median time of `from noire import Noire` exceeds this.",
+    )
+    parser.add_argument("--json", help="Also write the results to this file.")
+    args = parser.parse_args()
+
+    results: List[Dict[str, Any]] = []
+    print(f"{'statement':<32} {'min ms':>10} {'median ms':>10}  loaded")
+    for statement in STATEMENTS:
+        runs = [time_statement(statement) for _ in range(args.repeat)]
+        timings = [run["seconds"] for run in runs]
+        result = {
+            "statement": statement,
+            "min_s": min(timings),
+            "median_s": statistics.median(timings),
+            "loaded": runs[-1]["loaded"],
+        }
+        results.append(result)
+        print(
+            f"{statement:<32} {result['min_s'] * 1000:>10.2f} "
+            f"{result['median_s'] * 1000:>10.2f}  "
+            f"{', '.join(result['loaded']) or '-'}"
+        )
+
+    if args.json is not None:
+        report = {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": {"repeat": args.repeat},
+            "results": results,
+        }
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+    if args.max_ms is not None:
+        client = next(r for r in results if r["statement"] == STATEMENTS[1])
+        if client["median_s"] * 1000 > args.max_ms:
+            print(
+                f"ERROR: `{STATEMENTS[1]}` took {client['median_s'] * 1000:.2f} ms "
+                f"(the limit is {args.max_ms:.2f} ms)."
+            )
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
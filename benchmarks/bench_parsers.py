@@ -0,0 +1,478 @@
+"""
+Benchmarks Noire's page extractors on synthetic Mailman 2 pages.
+
+The pages are generated deterministically (fixed seeds) and entirely offline,
+so results are comparable across commits when run on the same machine with
+the same arguments. Each extractor is timed over several repetitions (we
+report the minimum and median wall time); peak memory is measured in a
+separate run under `tracemalloc` so that tracing does not skew the timings.
+
+Usage:
+    python benchmarks/bench_parsers.py --members 2000 --held 500
+    python benchmarks/bench_parsers.py --backend all --json results.json
+
+Before timing anything, every extractor's output is compared across all
+installed parser backends. Any difference makes the benchmark exit with an
+error; `--backend all` also fails if a backend is not installed.
+"""
+
+import argparse
+import functools
+import gc
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from noire.parsers.backend import (
+    ParserBackend,
+    is_parser_backend_available,
+    set_parser_backend,
+)
+from noire.parsers.members_list import (
+    extract_add_results,
+    extract_add_results_soup,
+    extract_emails_from_roster,
+    extract_emails_from_roster_soup,
+    extract_member_settings,
+    extract_member_settings_table,
+    extract_members_page,
+    extract_remove_results,
+    extract_remove_results_soup,
+)
+from noire.parsers.moderation import (
+    extract_moderation_post_details,
+    extract_moderation_requests,
+)
+from noire.parsers.settings import extract_general_options
+from noire.models.membership import MemberError, MembersPage, MemberSettingsTable
+from noire.models.moderation import ModerationRequestDetails
+from noire.testing.pages import (
+    render_add_results_page,
+    render_general_options_page,
+    render_members_page,
+    render_moderation_details_page,
+    render_moderation_page,
+    render_remove_results_page,
+    render_roster_page,
+    synthetic_emails,
+    synthetic_general_options,
+    synthetic_member_settings,
+    synthetic_moderation_requests,
+)
+
+
+def build_cases(args: argparse.Namespace) -> Dict[str, Any]:
+    roster_emails = synthetic_emails(args.roster, seed=1)
+    split = len(roster_emails) * 4 // 5
+    added_emails = synthetic_emails(args.added, seed=4)
+    add_results_page = render_add_results_page(
+        added_emails[10:],
+        [
+            MemberError(email=email, error_reason="Already a member")
+            for email in added_emails[:10]
+        ],
+    )
+    remove_results_page = render_remove_results_page(
+        added_emails[10:], added_emails[:10]
+    )
+    members = synthetic_member_settings(args.members, seed=0)
+    members_page = render_members_page(members)
+    paginated_members_page = render_members_page(
+        members[:30],
+        total_members=len(members),
+        letters=sorted({member.email[0] for member in members}),
+        current_letter=members[0].email[0],
+        chunk_ranges=[
+            (members[i].email, members[min(i + 29, len(members) - 1)].email)
+            for i in range(0, min(len(members), 90), 30)
+        ],
+    )
+    held = synthetic_moderation_requests(args.held, seed=2)
+    details = ModerationRequestDetails(
+        message_id=held[0].message_id,
+        message_contents="Hello & welcome,\n<b>not markup</b>\n" * 200,
+        message_headers="From: someone@example.com\nSubject: Hello\n",
+    )
+    return {
+        "extract_member_settings": (extract_member_settings, members_page),
+        "extract_member_settings_table": (extract_member_settings_table, members_page),
+        "extract_members_page": (extract_members_page, paginated_members_page),
+        "extract_emails_from_roster": (
+            extract_emails_from_roster,
+            render_roster_page(roster_emails[:split], roster_emails[split:]),
+        ),
+        "extract_emails_from_roster_soup": (
+            extract_emails_from_roster_soup,
+            render_roster_page(roster_emails[:split], roster_emails[split:]),
+        ),
+        "extract_add_results": (extract_add_results, add_results_page),
+        "extract_add_results_soup": (extract_add_results_soup, add_results_page),
+        "extract_remove_results": (extract_remove_results, remove_results_page),
+        "extract_remove_results_soup": (
+            extract_remove_results_soup,
+            remove_results_page,
+        ),
+        "extract_moderation_requests": (
+            extract_moderation_requests,
+            render_moderation_page(held),
+        ),
+        "extract_moderation_post_details": (
+            functools.partial(extract_moderation_post_details, details.message_id),
+            render_moderation_details_page(details, held[0]),
+        ),
+        "extract_general_options": (
+            extract_general_options,
+            render_general_options_page(synthetic_general_options()),
+        ),
+    }
+
+
+# Extractors that must produce the same output as a reference extractor.
+EQUIVALENT_EXTRACTORS = {
+    "extract_emails_from_roster": "extract_emails_from_roster_soup",
+    "extract_add_results": "extract_add_results_soup",
+    "extract_remove_results": "extract_remove_results_soup",
+}
+
+
+def fuzz_roster_page(rng: random.Random) -> str:
+    """
+    Generates a roster-like page with some of the irregularities that the
+    roster scanner must either handle or hand over to the tree builder.
+    """
+
+    def link_text() -> str:
+        kind = rng.random()
+        local = rng.choice(["alice", "b.o_b", "c+d", "x&amp;y", "e<b>f</b>", ""])
+        domain = rng.choice(["example.com", "EXAMPLE.org", "a b.net", "d&#46;com"])
+        if kind < 0.7:
+            return f"{local} at {domain}"
+        if kind < 0.8:
+            return f"{local}@{domain}"
+        if kind < 0.9:
+            return rng.choice(["", " ", "at", "x at", " at y", "a\nat b", "a  at b"])
+        return f"{local} AT {domain}"
+
+    def link() -> str:
+        tag = rng.choice(["a", "A"])
+        attributes = rng.choice(
+            ["", ' href="/mailman/options/l/x"', " title='a > b'", ' data-x="<ul>"']
+        )
+        closing = f"</{tag}>"
+        if rng.random() < 0.05:
+            closing = rng.choice([f"</{tag} >", ""])
+        anchor = f"<{tag}{attributes}>{link_text()}{closing}"
+        if rng.random() < 0.1:
+            anchor = f"<i>({anchor})</i>"
+        return anchor
+
+    parts = ["<HTML><BODY>\n", link(), "\n"]
+    for _ in range(rng.randint(0, 3)):
+        ul = rng.choice(["ul", "UL", "Ul"])
+        parts.append(f"<{ul}>\n")
+        for _ in range(rng.randint(0, 6)):
+            parts.append(f"<li>{link()}\n")
+            if rng.random() < 0.03:
+                parts.append("<!-- <a>hidden at example.com</a> -->")
+            if rng.random() < 0.02:
+                parts.append("<ul><li><a>nested at example.com</a></ul>")
+            if rng.random() < 0.02:
+                parts.append("<script>var s = '<a>x at y</a>';</script>")
+        if rng.random() > 0.03:
+            parts.append(f"</{ul}>\n")
+    parts.append("</BODY></HTML>\n")
+    return "".join(parts)
+
+
+def fuzz_results_page(rng: random.Random) -> str:
+    """
+    Generates an add or remove results page with some of the irregularities
+    that the section scanner must either handle or hand over to the tree
+    builder.
+    """
+    headings = [
+        "Successfully subscribed:",
+        "Error subscribing:",
+        "Successfully Unsubscribed:",
+    ]
+
+    def heading() -> str:
+        text = rng.choice(headings)
+        kind = rng.random()
+        if kind < 0.8:
+            return f"<h5>{text}</h5>"
+        return rng.choice(
+            [
+                f"<H5>{text}</H5>",
+                f"<h5> {text}</h5>",
+                f"<h5><b>{text}</b></h5>",
+                f"<h5>{text.replace(' ', '&#32;')}</h5>",
+                f'<h5 class="x">{text}</h5 >',
+                f"<h5>{text.lower()}</h5>",
+            ]
+        )
+
+    def item() -> str:
+        email = rng.choice(["alice@example.com", "b.o_b@example.org", "c+d@x.net"])
+        kind = rng.random()
+        if kind < 0.6:
+            return email
+        if kind < 0.8:
+            return f"{email} -- Already a member"
+        return rng.choice(
+            ["x&amp;y@example.com", "<b>bold</b>", "a -- b -- c", "  ", "q > r", ""]
+        )
+
+    parts = ["<HTML><BODY>\n"]
+    for _ in range(rng.randint(0, 4)):
+        parts.append(heading())
+        if rng.random() < 0.05:
+            parts.append("<p>Some text</p>")
+        if rng.random() < 0.03:
+            continue
+        parts.append(rng.choice(["\n<ul>\n", "\n<UL>\n", "<ul class='x'>"]))
+        for _ in range(rng.randint(0, 6)):
+            parts.append(rng.choice(["<li>", "<li>", "<li>", "<LI>", "</li><li>"]))
+            parts.append(item() + rng.choice(["\n", "\r\n", ""]))
+            if rng.random() < 0.02:
+                parts.append("<ul><li>nested@example.com</ul>")
+            if rng.random() < 0.02:
+                parts.append("<!-- <li>hidden@example.com -->")
+        if rng.random() > 0.03:
+            parts.append("</ul>\n")
+    parts.append("</BODY></HTML>\n")
+    return "".join(parts)
+
+
+# Extractors to compare on generated pages: (extractor, reference, generator).
+FUZZ_CASES = [
+    (extract_emails_from_roster, extract_emails_from_roster_soup, fuzz_roster_page),
+    (extract_add_results, extract_add_results_soup, fuzz_results_page),
+    (extract_remove_results, extract_remove_results_soup, fuzz_results_page),
+]
+
+
+def run_fuzz(count: int, seed: int) -> List[str]:
+    """
+    Checks that the equivalent extractors agree (including on the exceptions
+    they raise) on `count` generated pages each. Returns the failing pages.
+    """
+    rng = random.Random(seed)
+    failures = []
+
+    def outcome(extractor: Callable[[str], Any], raw_html: str) -> Any:
+        try:
+            return extractor(raw_html)
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            return type(ex)
+
+    for extractor, reference, generate in FUZZ_CASES:
+        for _ in range(count):
+            raw_html = generate(rng)
+            if outcome(extractor, raw_html) != outcome(reference, raw_html):
+                failures.append(raw_html)
+    return failures
+
+
+def comparable(output: Any) -> Any:
+    """
+    Returns a value that compares equal for equal extractor outputs.
+    `MemberSettingsTable` does not define equality, so tables are compared as
+    lists of settings.
+    """
+    if isinstance(output, MemberSettingsTable):
+        return output.to_member_settings()
+    if isinstance(output, MembersPage):
+        return (comparable(output.members), output.model_dump(exclude={"members"}))
+    return output
+
+
+def check_backends(
+    cases: Dict[str, Any], backends: List[ParserBackend]
+) -> Tuple[Dict[str, Any], List[Tuple[str, str]]]:
+    """
+    Runs every extractor with each of `backends` and compares the outputs with
+    the first backend's. Returns the first backend's outputs and the
+    (extractor, backend) pairs whose output differed.
+    """
+    outputs: Dict[str, Any] = {}
+    mismatches = []
+    for backend in backends:
+        set_parser_backend(backend)
+        for name, (extractor, raw_html) in cases.items():
+            output = comparable(extractor(raw_html))
+            if name not in outputs:
+                outputs[name] = output
+            elif output != outputs[name]:
+                mismatches.append((name, f"the {backend.value} backend"))
+    return outputs, mismatches
+
+
+def time_extractor(
+    extractor: Callable[[str], Any], raw_html: str, repeat: int
+) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        extractor(raw_html)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def peak_memory_of(extractor: Callable[[str], Any], raw_html: str) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        extractor(raw_html)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--members", type=int, default=2000, help="Rows on the members page."
+    )
+    parser.add_argument(
+        "--roster", type=int, default=5000, help="Entries on the roster."
+    )
+    parser.add_argument(
+        "--held", type=int, default=200, help="Held messages on admindb."
+    )
+    parser.add_argument(
+        "--added",
+        type=int,
+        default=5000,
+        help="Emails on the add and remove results pages.",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed runs per extractor."
+    )
+    parser.add_argument(
+        "--backend",
+        choices=[backend.value for backend in ParserBackend] + ["all"],
+        default=ParserBackend.HtmlParser.value,
+        help="The parser backend to benchmark (or 'all' installed backends).",
+    )
+    parser.add_argument("--only", help="Only run extractors containing this string.")
+    parser.add_argument(
+        "--fuzz",
+        type=int,
+        default=0,
+        help="Also check equivalent extractors on this many generated pages.",
+    )
+    parser.add_argument("--json", help="Also write the results to this file.")
+    args = parser.parse_args()
+
+    installed = [b for b in ParserBackend if is_parser_backend_available(b)]
+    missing = [b.value for b in ParserBackend if b not in installed]
+    if args.backend == "all":
+        if len(missing) > 0:
+            print(f"ERROR: Not installed: {', '.join(missing)}.")
+            return 1
+        backends = installed
+    else:
+        backends = [ParserBackend(args.backend)]
+        if backends[0] not in installed:
+            print(f"ERROR: The {args.backend} backend is not installed.")
+            return 1
+
+    cases = build_cases(args)
+    if args.only is not None:
+        cases = {name: case for name, case in cases.items() if args.only in name}
+
+    # All installed backends must produce identical output, whichever backends
+    # are benchmarked.
+    reference_outputs, mismatches = check_backends(cases, installed)
+    if len(missing) > 0:
+        print(
+            f"WARNING: Not installed: {', '.join(missing)}. Only "
+            f"{', '.join(b.value for b in installed)} was checked; use "
+            "--backend all to require every backend."
+        )
+
+    results = []
+    print(
+        f"{'extractor':<32} {'backend':<12} {'size':>10} {'min ms':>10} {'median ms':>10} {'peak MiB':>9}"
+    )
+    for backend in backends:
+        set_parser_backend(backend)
+        for name, (extractor, raw_html) in cases.items():
+            timings = time_extractor(extractor, raw_html, args.repeat)
+            peak = peak_memory_of(extractor, raw_html)
+            result = {
+                "extractor": name,
+                "backend": backend.value,
+                "html_bytes": len(raw_html),
+                "min_s": min(timings),
+                "median_s": statistics.median(timings),
+                "peak_memory_bytes": peak,
+            }
+            results.append(result)
+            print(
+                f"{name:<32} {backend.value:<12} {len(raw_html):>10} "
+                f"{result['min_s'] * 1000:>10.2f} {result['median_s'] * 1000:>10.2f} "
+                f"{peak / 2**20:>9.2f}"
+            )
+
+    if args.json is not None:
+        report = {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": {
+                "members": args.members,
+                "roster": args.roster,
+                "held": args.held,
+                "added": args.added,
+                "repeat": args.repeat,
+            },
+            "results": results,
+        }
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+    for name, reference in EQUIVALENT_EXTRACTORS.items():
+        if name in reference_outputs and reference in reference_outputs:
+            if reference_outputs[name] != reference_outputs[reference]:
+                mismatches.append((name, reference))
+
+    fuzz_failures: List[str] = []
+    for backend in backends if args.fuzz > 0 else []:
+        set_parser_backend(backend)
+        fuzz_failures.extend(run_fuzz(args.fuzz, seed=3))
+    if args.fuzz > 0:
+        print(
+            f"Fuzzed {args.fuzz} pages per extractor and backend: {len(fuzz_failures)} failed."
+        )
+
+    for name, other in mismatches:
+        print(f"ERROR: {name} output differs with {other}.")
+    for raw_html in fuzz_failures[:3]:
+        print(f"ERROR: Equivalent extractors disagree on:\n{raw_html}")
+    return 1 if mismatches or fuzz_failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+Benchmarks Noire's concurrent reads against recorded Mailman traffic.
+
+First record a cassette against a real list (this reads the list password
+from NOIRE_LIST_PASSWORD). Later, replay it offline with simulated latency
+and bandwidth, as often as needed. Each read is timed for every
+`--max-workers` value over several repetitions (we report the minimum and
+median wall time).
+
+Usage:
+    python benchmarks/bench_replay.py record mylist.cassette \\
+        --list mylist --base-url https://lists.example.com/mailman
+    python benchmarks/bench_replay.py replay mylist.cassette \\
+        --list mylist --base-url https://lists.example.com/mailman \\
+        --latency-ms 80 --bandwidth-kib 2048 --max-workers 1 4 8 --json results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+import requests
+
+from noire.noire import Noire
+from noire.testing.cassette import Cassette, RecordingAdapter, ReplayAdapter, mount
+
+
+def reads(client: Noire, max_workers: int) -> Dict[str, Callable[[], Any]]:
+    return {
+        "get_member_emails": client.get_member_emails,
+        "get_moderation_requests": client.get_moderation_requests,
+        "get_general_options": client.get_general_options,
+        "get_member_settings_table": lambda: client.get_member_settings_table(
+            max_workers=max_workers
+        ),
+    }
+
+
+def record(args: argparse.Namespace) -> int:
+    password = os.environ.get("NOIRE_LIST_PASSWORD")
+    if password is None:
+        print("ERROR: Set NOIRE_LIST_PASSWORD to record a cassette.")
+        return 1
+    cassette = Cassette()
+    session = mount(requests.Session(), RecordingAdapter(cassette))
+    client = Noire.create_client(args.list, password, args.base_url, session=session)
+    for name, read in reads(client, max_workers=8).items():
+        read()
+        print(f"Recorded {name}.")
+    cassette.save(args.cassette)
+    print(f"Saved {len(cassette)} responses to {args.cassette}.")
+    return 0
+
+
+def replay(args: argparse.Namespace) -> int:
+    cassette = Cassette.load(args.cassette)
+    adapter = ReplayAdapter(
+        cassette,
+        latency_seconds=(
+            args.latency_ms / 1000 if args.latency_ms is not None else None
+        ),
+        bandwidth_bytes_per_second=(
+            args.bandwidth_kib * 1024 if args.bandwidth_kib is not None else None
+        ),
+    )
+
+    results = []
+    print(f"{'read':<30} {'workers':>8} {'min ms':>10} {'median ms':>10}")
+    for max_workers in args.max_workers:
+        timings: Dict[str, List[float]] = {}
+        for _ in range(args.repeat):
+            cassette.rewind()
+            session = mount(requests.Session(), adapter)
+            # The password is not recorded, so any password replays the log in.
+            client = Noire.create_client(args.list, "", args.base_url, session=session)
+            for name, read in reads(client, max_workers).items():
+                if args.only is not None and args.only not in name:
+                    continue
+                start = time.perf_counter()
+                read()
+                timings.setdefault(name, []).append(time.perf_counter() - start)
+
+        for name, runs in timings.items():
+            result = {
+                "read": name,
+                "max_workers": max_workers,
+                "min_s": min(runs),
+                "median_s": statistics.median(runs),
+            }
+            results.append(result)
+            print(
+                f"{name:<30} {max_workers:>8} {result['min_s'] * 1000:>10.2f} "
+                f"{result['median_s'] * 1000:>10.2f}"
+            )
+
+    if args.json is not None:
+        report = {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": {
+                "cassette": os.path.basename(args.cassette),
+                "latency_ms": args.latency_ms,
+                "bandwidth_kib": args.bandwidth_kib,
+                "repeat": args.repeat,
+            },
+            "results": results,
+        }
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    return 0
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("cassette", help="The cassette file.")
+    parser.add_argument("--list", required=True, help="The list's name.")
+    parser.add_argument("--base-url", required=True, help="The Mailman base URL.")
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        help="Simulated latency per request (default: the recorded latency).",
+    )
+    parser.add_argument(
+        "--bandwidth-kib", type=float, help="Simulated bandwidth, in KiB/s."
+    )
+    parser.add_argument(
+        "--max-workers", type=int, nargs="+", default=[1, 8], help="Workers to try."
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per read.")
+    parser.add_argument("--only", help="Only run reads containing this string.")
+    parser.add_argument("--json", help="Also write the results to this file.")
+    args = parser.parse_args()
+
+    if args.mode == "record":
+        return record(args)
+    return replay(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,7 +19,11 @@ PYTHON_REQUIRES = ">=3.10"
 PACKAGE_DATA = {}
 PACKAGE_DIR = {"": "src"}
 
-ENTRY_POINTS = {}
+ENTRY_POINTS = {
+    "console_scripts": [
+        "noire = noire.cli:main",
+    ],
+}
 
 INSTALL_REQUIRES = [
     "beautifulsoup4>=4.12.2",
@@ -36,6 +40,10 @@ DEV_REQUIRES = [
     "types-requests",
 ]
 
+LXML_REQUIRES = [
+    "lxml",
+]
+
 KEYWORDS = []
 
 CLASSIFIERS = [
@@ -93,6 +101,7 @@ if __name__ == "__main__":
         install_requires=INSTALL_REQUIRES,
         extras_require={
             "dev": DEV_REQUIRES,
+            "lxml": LXML_REQUIRES,
         },
         entry_points=ENTRY_POINTS,
         classifiers=CLASSIFIERS,
@@ -1,4 +1,10 @@
-from .noire import Noire
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .noire import Noire
+    from .async_noire import AsyncNoire
+    from .fleet import NoireFleet
 
 __version__ = "0.5.0+dev"
 
@@ -7,3 +13,24 @@ __email__ = "geoffxy@gmail.com"
 
 __description__ = "Programmatic access to Mailman 2 via its publicly-accessible web interface."
 __url__ = "https://github.com/geoffxy/noire/"
+
+# The clients are imported on first use, so that `import noire` stays cheap
+# and scripts only load the parts of Noire that they use.
+_LAZY_ATTRIBUTES = {
+    "Noire": ".noire",
+    "AsyncNoire": ".async_noire",
+    "NoireFleet": ".fleet",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
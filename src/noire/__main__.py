@@ -0,0 +1,5 @@
+import sys
+
+from noire.cli import main
+
+sys.exit(main())
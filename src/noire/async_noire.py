@@ -0,0 +1,419 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import itertools
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from noire.cache import ReadCache
+from noire.instrumentation import Observer
+from noire.noire import Noire
+from noire.session_store import SessionStore
+from noire.transport import Transport
+
+if TYPE_CHECKING:
+    from noire.models.membership import (
+        BulkAddResults,
+        BulkRemoveResults,
+        MemberSettings,
+        MemberSettingsChanges,
+        MemberSettingsTable,
+        SyncResults,
+    )
+    from noire.models.moderation import (
+        BatchModerationResults,
+        ModerationDecision,
+        ModerationRequest,
+        ModerationRequestDetails,
+        ModerationAction,
+    )
+    from noire.models.settings import GeneralOptions, GeneralOptionsChanges
+
+T = TypeVar("T")
+
+# The number of member settings to pull from a synchronous iterator per worker
+# call.
+_ITER_BATCH_SIZE = 100
+
+
+class AsyncNoire:
+    """
+    An asyncio counterpart to `Noire`. It exposes the same methods as `Noire`,
+    but as coroutines, so that one process can keep many requests to Mailman
+    in flight at once.
+
+    Requests are issued over a pooled HTTP connection. The number of requests
+    in flight (and the number of open connections) is bounded by
+    `max_connections`. Clients created with the same `executor` share one
+    bounded pool of workers, and clients created with the same `adapter` (see
+    `create_connection_pool()`) share one bounded pool of connections:
+
+        pool = create_connection_pool(max_connections=10)
+        clients = [
+            await AsyncNoire.create_client(name, password, base_url, adapter=pool)
+            for name, password in credentials.items()
+        ]
+    """
+
+    @classmethod
+    async def create_client(
+        cls,
+        list_name: str,
+        list_password: str,
+        mailman_base_url: str,
+        max_connections: int = 10,
+        executor: Optional[ThreadPoolExecutor] = None,
+        cache: Optional[ReadCache] = None,
+        session_store: Optional[SessionStore] = None,
+        transport: Optional[Transport] = None,
+        observer: Optional[Observer] = None,
+        adapter: Optional[requests.adapters.HTTPAdapter] = None,
+    ) -> "AsyncNoire":
+        owns_executor = executor is None
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=max_connections, thread_name_prefix="noire"
+            )
+        owns_adapter = adapter is None
+        if adapter is None:
+            adapter = create_connection_pool(max_connections)
+        # Each client has its own session (and so its own cookies), but the
+        # connections come from `adapter`.
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        loop = asyncio.get_running_loop()
+        try:
+            client = await loop.run_in_executor(
+                executor,
+                functools.partial(
+                    Noire.create_client,
+                    list_name,
+                    list_password,
+                    mailman_base_url,
+                    session=session,
+                    cache=cache,
+                    session_store=session_store,
+                    transport=transport,
+                    observer=observer,
+                ),
+            )
+        except Exception:
+            if owns_adapter:
+                session.close()
+            if owns_executor:
+                executor.shutdown(wait=False)
+            raise
+        return cls(client, max_connections, executor, owns_executor, owns_adapter)
+
+    def __init__(
+        self,
+        client: Noire,
+        max_connections: int,
+        executor: ThreadPoolExecutor,
+        owns_executor: bool = False,
+        owns_adapter: bool = True,
+    ) -> None:
+        self._client = client
+        self._executor = executor
+        self._owns_executor = owns_executor
+        self._owns_adapter = owns_adapter
+        self._semaphore = asyncio.Semaphore(max_connections)
+
+    @property
+    def client(self) -> Noire:
+        """
+        The underlying synchronous client.
+        """
+        return self._client
+
+    async def close(self) -> None:
+        """
+        Releases the pooled connections held by this client. A shared
+        `adapter` is left open for the other clients; close it once they are
+        all closed.
+        """
+        if self._owns_adapter:
+            # pylint: disable-next=protected-access
+            self._client._session.close()
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
+
+    async def __aenter__(self) -> "AsyncNoire":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    async def get_member_emails(self) -> List[str]:
+        return await self._run(self._client.get_member_emails)
+
+    async def get_moderation_requests(self) -> List[ModerationRequest]:
+        return await self._run(self._client.get_moderation_requests)
+
+    async def get_moderation_requests_if_changed(
+        self, previous_page_hash: Optional[bytes]
+    ) -> Tuple[bytes, Optional[List[ModerationRequest]]]:
+        return await self._run(
+            self._client.get_moderation_requests_if_changed, previous_page_hash
+        )
+
+    async def get_moderation_details(
+        self, message_id: int
+    ) -> Optional[ModerationRequestDetails]:
+        return await self._run(self._client.get_moderation_details, message_id)
+
+    async def get_moderation_details_many(
+        self, message_ids: List[int], max_workers: int = 8
+    ) -> List[Optional[ModerationRequestDetails]]:
+        return await self._run(
+            self._client.get_moderation_details_many, message_ids, max_workers
+        )
+
+    async def apply_moderation_action(
+        self,
+        message_id: int,
+        action: ModerationAction,
+        rejection_message: Optional[str] = None,
+        preserve_message_for_admin: bool = False,
+        forward_message_to_list_owner: bool = False,
+    ) -> bool:
+        return await self._run(
+            self._client.apply_moderation_action,
+            message_id,
+            action,
+            rejection_message=rejection_message,
+            preserve_message_for_admin=preserve_message_for_admin,
+            forward_message_to_list_owner=forward_message_to_list_owner,
+        )
+
+    async def apply_moderation_actions(
+        self, decisions: Dict[int, ModerationDecision], batch_size: int = 100
+    ) -> BatchModerationResults:
+        return await self._run(
+            self._client.apply_moderation_actions, decisions, batch_size
+        )
+
+    async def add_members(
+        self,
+        emails: List[str],
+        send_welcome_message: bool = False,
+        send_owner_notifications: bool = False,
+    ) -> BulkAddResults:
+        return await self._run(
+            self._client.add_members,
+            emails,
+            send_welcome_message=send_welcome_message,
+            send_owner_notifications=send_owner_notifications,
+        )
+
+    async def add_members_in_batches(
+        self,
+        emails: List[str],
+        batch_size: int = 500,
+        max_workers: int = 1,
+        send_welcome_message: bool = False,
+        send_owner_notifications: bool = False,
+    ) -> BulkAddResults:
+        return await self._run(
+            self._client.add_members_in_batches,
+            emails,
+            batch_size=batch_size,
+            max_workers=max_workers,
+            send_welcome_message=send_welcome_message,
+            send_owner_notifications=send_owner_notifications,
+        )
+
+    async def remove_members(
+        self,
+        emails: List[str],
+        send_unsubscribe_message: bool = False,
+        send_owner_notifications: bool = False,
+    ) -> BulkRemoveResults:
+        return await self._run(
+            self._client.remove_members,
+            emails,
+            send_unsubscribe_message=send_unsubscribe_message,
+            send_owner_notifications=send_owner_notifications,
+        )
+
+    async def remove_members_in_batches(
+        self,
+        emails: List[str],
+        batch_size: int = 500,
+        max_workers: int = 1,
+        send_unsubscribe_message: bool = False,
+        send_owner_notifications: bool = False,
+    ) -> BulkRemoveResults:
+        return await self._run(
+            self._client.remove_members_in_batches,
+            emails,
+            batch_size=batch_size,
+            max_workers=max_workers,
+            send_unsubscribe_message=send_unsubscribe_message,
+            send_owner_notifications=send_owner_notifications,
+        )
+
+    async def sync_members(self, emails: List[str]) -> bool:
+        return await self._run(self._client.sync_members, emails)
+
+    async def sync_members_by_diff(
+        self,
+        emails: List[str],
+        batch_size: int = 500,
+        max_workers: int = 1,
+        send_welcome_message: bool = False,
+        send_unsubscribe_message: bool = False,
+        send_owner_notifications: bool = False,
+    ) -> SyncResults:
+        return await self._run(
+            self._client.sync_members_by_diff,
+            emails,
+            batch_size=batch_size,
+            max_workers=max_workers,
+            send_welcome_message=send_welcome_message,
+            send_unsubscribe_message=send_unsubscribe_message,
+            send_owner_notifications=send_owner_notifications,
+        )
+
+    async def bulk_set_moderation_flag(self, should_moderate: bool) -> bool:
+        return await self._run(self._client.bulk_set_moderation_flag, should_moderate)
+
+    async def get_member_subscription_settings(
+        self, email: str
+    ) -> Optional[MemberSettings]:
+        return await self._run(self._client.get_member_subscription_settings, email)
+
+    async def get_member_subscription_settings_many(
+        self,
+        emails: List[str],
+        max_search_length: int = 4096,
+        max_workers: int = 8,
+    ) -> Dict[str, Optional[MemberSettings]]:
+        return await self._run(
+            self._client.get_member_subscription_settings_many,
+            emails,
+            max_search_length=max_search_length,
+            max_workers=max_workers,
+        )
+
+    async def bulk_fetch_member_subscription_settings(
+        self,
+        emails: Optional[List[str]] = None,
+        paginated: bool = False,
+        max_workers: int = 8,
+    ) -> List[MemberSettings]:
+        return await self._run(
+            self._client.bulk_fetch_member_subscription_settings,
+            emails,
+            paginated,
+            max_workers,
+        )
+
+    async def iter_member_settings(
+        self, max_workers: int = 8
+    ) -> AsyncIterator[MemberSettings]:
+        iterator = self._client.iter_member_settings(max_workers)
+        while True:
+            batch = await self._run(
+                lambda: list(itertools.islice(iterator, _ITER_BATCH_SIZE))
+            )
+            if len(batch) == 0:
+                return
+            for setting in batch:
+                yield setting
+
+    async def get_member_settings_table(
+        self, max_workers: int = 8
+    ) -> MemberSettingsTable:
+        return await self._run(self._client.get_member_settings_table, max_workers)
+
+    async def set_member_subscription_settings(
+        self, settings: List[MemberSettings]
+    ) -> bool:
+        return await self._run(self._client.set_member_subscription_settings, settings)
+
+    async def update_member_subscription_settings(
+        self,
+        settings: List[MemberSettings],
+        current_settings: Optional[List[MemberSettings]] = None,
+        batch_size: int = 200,
+        max_workers: int = 1,
+    ) -> List[MemberSettings]:
+        return await self._run(
+            self._client.update_member_subscription_settings,
+            settings,
+            current_settings=current_settings,
+            batch_size=batch_size,
+            max_workers=max_workers,
+        )
+
+    async def change_member_subscription_settings(
+        self,
+        emails: List[str],
+        changes: MemberSettingsChanges,
+        current_settings: Optional[List[MemberSettings]] = None,
+        batch_size: int = 200,
+        max_workers: int = 1,
+    ) -> List[MemberSettings]:
+        return await self._run(
+            self._client.change_member_subscription_settings,
+            emails,
+            changes,
+            current_settings=current_settings,
+            batch_size=batch_size,
+            max_workers=max_workers,
+        )
+
+    async def set_accept_these_nonmembers(self, emails: List[str]) -> bool:
+        return await self._run(self._client.set_accept_these_nonmembers, emails)
+
+    async def set_default_member_moderation(self, should_moderate: bool) -> bool:
+        return await self._run(
+            self._client.set_default_member_moderation, should_moderate
+        )
+
+    async def get_general_options(self) -> GeneralOptions:
+        return await self._run(self._client.get_general_options)
+
+    async def set_general_options(
+        self,
+        changes: GeneralOptionsChanges,
+        current_options: Optional[GeneralOptions] = None,
+    ) -> bool:
+        return await self._run(
+            self._client.set_general_options, changes, current_options
+        )
+
+    async def _run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            return await loop.run_in_executor(
+                self._executor, functools.partial(fn, *args, **kwargs)
+            )
+
+
+def create_connection_pool(
+    max_connections: int = 10, max_hosts: int = 1
+) -> requests.adapters.HTTPAdapter:
+    """
+    Returns an adapter that keeps at most `max_connections` connections open
+    to each of up to `max_hosts` Mailman hosts. Requests wait for a free
+    connection instead of opening more. Pass it as the `adapter` of several
+    `AsyncNoire` clients to bound their connections together.
+    """
+    return requests.adapters.HTTPAdapter(
+        pool_connections=max_hosts, pool_maxsize=max_connections, pool_block=True
+    )
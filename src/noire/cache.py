@@ -0,0 +1,82 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class ReadCache:
+    """
+    An opt-in cache for the results of `Noire`'s read methods (e.g., the
+    roster, member settings and general options).
+
+    Entries expire after `ttl_seconds`. Once the cache holds `max_entries`
+    entries, the least recently used entry is evicted. `Noire` clears the
+    cache whenever it modifies the list, so reads that follow a write always
+    go to Mailman. The cache is safe to use from multiple threads, and may be
+    shared by clients for different lists (their entries are kept apart).
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 60.0,
+        max_entries: int = 128,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("The cache must hold at least 1 entry.")
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        # Incremented on every invalidation (of the whole cache and of each
+        # key). A value fetched while its key was invalidated may be stale, so
+        # it is not stored.
+        self._generation = 0
+        self._key_generations: Dict[Hashable, int] = {}
+
+    def get_or_fetch(self, key: Hashable, fetch: Callable[[], T]) -> T:
+        """
+        Returns the cached value for `key`. If there is no fresh value, this
+        calls `fetch` and caches its result.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if self._clock() < expires_at:
+                    self._entries.move_to_end(key)
+                    return value
+                del self._entries[key]
+            generation = (self._generation, self._key_generations.get(key, 0))
+
+        value = fetch()
+
+        with self._lock:
+            if generation == (self._generation, self._key_generations.get(key, 0)):
+                self._entries[key] = (self._clock() + self._ttl_seconds, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """
+        Removes the cached values for `keys`, or all cached values if no keys
+        are given.
+        """
+        with self._lock:
+            if len(keys) == 0:
+                self._entries.clear()
+                self._key_generations.clear()
+                self._generation += 1
+                return
+            for key in keys:
+                self._entries.pop(key, None)
+                self._key_generations[key] = self._key_generations.get(key, 0) + 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
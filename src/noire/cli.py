@@ -0,0 +1,208 @@
+"""
+The `noire` command.
+
+`noire daemon` starts a long-running process that keeps logged in clients
+(and their caches) for the lists it is asked about. The other subcommands
+send their request to the daemon when it is running, so that they skip
+importing the parsers and logging in; otherwise they run the request
+themselves.
+
+The Mailman base URL and list password are read from `--base-url` (or
+`NOIRE_BASE_URL`) and `NOIRE_LIST_PASSWORD` (or a prompt).
+"""
+
+import argparse
+import getpass
+import json
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+from noire.daemon import NoireDaemon, default_socket_path, run_command, send_request
+
+_EMAILS_COMMANDS = ["add", "remove", "sync"]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    socket_path = args.socket if args.socket is not None else default_socket_path()
+
+    if args.command == "daemon":
+        return _run_daemon(args, socket_path)
+    if args.command == "stop":
+        try:
+            send_request(socket_path, {"command": "shutdown"})
+        except OSError:
+            print("error: The noire daemon is not running.", file=sys.stderr)
+            return 1
+        return 0
+
+    base_url = args.base_url or os.environ.get("NOIRE_BASE_URL")
+    if base_url is None:
+        print(
+            "error: Specify the Mailman base URL using --base-url or NOIRE_BASE_URL.",
+            file=sys.stderr,
+        )
+        return 1
+    password = os.environ.get("NOIRE_LIST_PASSWORD")
+    if password is None:
+        password = getpass.getpass(f"Password for {args.list}: ")
+
+    command_args: Dict[str, Any] = {}
+    if args.command in _EMAILS_COMMANDS:
+        command_args["emails"] = _read_emails(args.file)
+    elif args.command == "moderate":
+        command_args["action"] = args.action
+        command_args["message_ids"] = args.message_ids
+        command_args["rejection_message"] = args.rejection_message
+
+    request = {
+        "command": args.command,
+        "list": args.list,
+        "base_url": base_url,
+        "password": password,
+        "args": command_args,
+    }
+    response = None
+    if not args.no_daemon:
+        try:
+            response = send_request(socket_path, request)
+        except OSError:
+            # The daemon is not running.
+            response = None
+        except (RuntimeError, ValueError) as ex:
+            # The daemon is running, but did not reply with a valid response.
+            print(f"error: The noire daemon failed: {ex}", file=sys.stderr)
+            return 1
+    if response is None:
+        response = _run_in_process(request, use_session_store=not args.no_session_store)
+
+    if not response["ok"]:
+        print(f"error: {response['error']}", file=sys.stderr)
+        return 1
+    _print_result(response["result"])
+    return 0
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="noire", description=__doc__.split("\n\n")[1].strip()
+    )
+    parser.add_argument(
+        "--socket",
+        help="The daemon's socket (default: $XDG_RUNTIME_DIR/noire/daemon.sock).",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    daemon = subparsers.add_parser("daemon", help="Run the noire daemon.")
+    daemon.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=60.0,
+        help="Seconds to cache reads for (0 disables caching).",
+    )
+    daemon.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=8,
+        help="Requests to send to each Mailman host at once.",
+    )
+    daemon.add_argument(
+        "--no-session-store",
+        action="store_true",
+        help="Do not persist login sessions across daemon restarts.",
+    )
+    subparsers.add_parser("stop", help="Stop the noire daemon.")
+
+    def add_list_command(name: str, help_text: str) -> argparse.ArgumentParser:
+        command = subparsers.add_parser(name, help=help_text)
+        command.add_argument("list", help="The list's name.")
+        command.add_argument("--base-url", help="The Mailman base URL.")
+        command.add_argument(
+            "--no-daemon",
+            action="store_true",
+            help="Run the request in this process, even if the daemon is running.",
+        )
+        command.add_argument(
+            "--no-session-store",
+            action="store_true",
+            help=(
+                "Do not reuse or save a login session on disk when running the"
+                " request in this process."
+            ),
+        )
+        return command
+
+    add_list_command("members", "Print the list's members.")
+    add_list_command("held", "Print the messages held for moderation.")
+    add_list_command("options", "Print the list's general options.")
+    moderate = add_list_command("moderate", "Moderate held messages.")
+    moderate.add_argument("action", choices=["approve", "reject", "discard", "defer"])
+    moderate.add_argument("message_ids", type=int, nargs="+", metavar="message_id")
+    moderate.add_argument("--rejection-message")
+    for name, help_text in [
+        ("add", "Subscribe emails to the list."),
+        ("remove", "Unsubscribe emails from the list."),
+        ("sync", "Make the list's members match the given emails."),
+    ]:
+        command = add_list_command(name, help_text)
+        command.add_argument(
+            "file",
+            nargs="?",
+            default="-",
+            help="A file with one email per line (default: standard input).",
+        )
+    return parser
+
+
+def _run_daemon(args: argparse.Namespace, socket_path: Any) -> int:
+    from noire.session_store import SessionStore
+
+    daemon = NoireDaemon(
+        socket_path,
+        cache_ttl_seconds=args.cache_ttl,
+        session_store=None if args.no_session_store else SessionStore(),
+        max_concurrency=args.max_concurrency,
+    )
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except RuntimeError as ex:
+        print(f"error: {ex}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def _run_in_process(request: Dict[str, Any], use_session_store: bool) -> Dict[str, Any]:
+    from noire.noire import Noire
+    from noire.session_store import SessionStore
+
+    try:
+        client = Noire.create_client(
+            request["list"],
+            request["password"],
+            request["base_url"],
+            session_store=SessionStore() if use_session_store else None,
+        )
+        result = run_command(client, request["command"], request["args"])
+    except Exception as ex:  # pylint: disable=broad-exception-caught
+        return {"ok": False, "error": str(ex) or type(ex).__name__}
+    return {"ok": True, "result": result}
+
+
+def _read_emails(path: str) -> List[str]:
+    if path == "-":
+        lines = sys.stdin.readlines()
+    else:
+        with open(path, "r", encoding="utf-8") as file:
+            lines = file.readlines()
+    return [line.strip() for line in lines if len(line.strip()) > 0]
+
+
+def _print_result(result: Any) -> None:
+    if isinstance(result, list) and all(isinstance(item, str) for item in result):
+        for item in result:
+            print(item)
+    elif result is not None:
+        print(json.dumps(result, indent=2))
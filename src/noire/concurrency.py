@@ -0,0 +1,35 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def map_concurrently(
+    fn: Callable[[T], R], items: Sequence[T], max_workers: int
+) -> List[R]:
+    """
+    Applies `fn` to each item using at most `max_workers` threads and returns
+    the results in the same order as `items`. If any call raises, the first
+    exception (in input order) is re-raised after the in-flight calls finish.
+    """
+    if max_workers <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+    # Run each call in a copy of the caller's context so that context variables
+    # (e.g., the instrumentation scope) carry over to the worker threads.
+    contexts = [contextvars.copy_context() for _ in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(lambda ctx, item: ctx.run(fn, item), contexts, items))
+
+
+def iter_concurrently(
+    fn: Callable[[T], R], items: Sequence[T], max_workers: int
+) -> Iterator[R]:
+    """
+    Like `map_concurrently()`, but yields the results lazily in the same order
+    as `items`. At most `max_workers` results are held at once.
+    """
+    batch_size = max(max_workers, 1)
+    for start in range(0, len(items), batch_size):
+        yield from map_concurrently(fn, items[start : start + batch_size], max_workers)
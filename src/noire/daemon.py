@@ -0,0 +1,270 @@
+import hashlib
+import hmac
+import json
+import os
+import pathlib
+import socket
+import socketserver
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from noire.noire import Noire
+    from noire.session_store import SessionStore
+    from noire.transport import Transport
+
+# Requests and responses are JSON objects, one per line. A connection carries
+# one request and its response.
+#
+# Request:  {"command": ..., "list": ..., "base_url": ..., "password": ...,
+#            "args": {...}}
+# Response: {"ok": true, "result": ...} or {"ok": false, "error": ...}
+_MAX_REQUEST_BYTES = 64 * 1024 * 1024
+
+
+def default_socket_path() -> pathlib.Path:
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir is None:
+        runtime_dir = os.environ.get("XDG_CACHE_HOME", "~/.cache")
+    return pathlib.Path(runtime_dir).expanduser() / "noire" / "daemon.sock"
+
+
+def send_request(
+    socket_path: Union[str, os.PathLike], request: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Sends `request` to the daemon listening on `socket_path` and returns its
+    response. Raises `OSError` if the daemon is not running.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(os.fspath(socket_path))
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        sock.shutdown(socket.SHUT_WR)
+        with sock.makefile("rb") as file:
+            line = file.readline()
+    if len(line) == 0:
+        raise RuntimeError("The noire daemon closed the connection unexpectedly.")
+    return json.loads(line)
+
+
+def run_command(client: "Noire", command: str, args: Dict[str, Any]) -> Any:
+    """
+    Runs one of the `COMMANDS` using `client` and returns its result as a
+    JSON-serializable value.
+    """
+    handler = COMMANDS.get(command)
+    if handler is None:
+        raise ValueError(f"Unknown command: {command}")
+    return handler(client, args)
+
+
+def _members(client: "Noire", _args: Dict[str, Any]) -> Any:
+    return client.get_member_emails()
+
+
+def _held(client: "Noire", _args: Dict[str, Any]) -> Any:
+    return [
+        request.model_dump(mode="json") for request in client.get_moderation_requests()
+    ]
+
+
+def _moderate(client: "Noire", args: Dict[str, Any]) -> Any:
+    from noire.models.moderation import ModerationAction, ModerationDecision
+
+    decision = ModerationDecision(
+        action=ModerationAction[args["action"].capitalize()],
+        rejection_message=args.get("rejection_message"),
+    )
+    return client.apply_moderation_actions(
+        {message_id: decision for message_id in args["message_ids"]}
+    ).model_dump(mode="json")
+
+
+def _add(client: "Noire", args: Dict[str, Any]) -> Any:
+    return client.add_members_in_batches(args["emails"]).model_dump(mode="json")
+
+
+def _remove(client: "Noire", args: Dict[str, Any]) -> Any:
+    return client.remove_members_in_batches(args["emails"]).model_dump(mode="json")
+
+
+def _sync(client: "Noire", args: Dict[str, Any]) -> Any:
+    return client.sync_members_by_diff(args["emails"]).model_dump(mode="json")
+
+
+def _options(client: "Noire", _args: Dict[str, Any]) -> Any:
+    return client.get_general_options().model_dump(mode="json")
+
+
+COMMANDS: Dict[str, Callable[["Noire", Dict[str, Any]], Any]] = {
+    "members": _members,
+    "held": _held,
+    "moderate": _moderate,
+    "add": _add,
+    "remove": _remove,
+    "sync": _sync,
+    "options": _options,
+}
+
+
+class NoireDaemon:
+    """
+    Serves `COMMANDS` over a Unix socket, so that short-lived scripts can
+    share long-lived `Noire` clients.
+
+    The daemon logs in to a list on its first request and keeps the client
+    (and its read cache) for later requests. Every request must carry the
+    list's password. A request with a password that differs from the one the
+    client logged in with logs in again; if Mailman accepts the new password,
+    it replaces the client, and otherwise the request fails. The socket is
+    only accessible by the current user.
+    """
+
+    def __init__(
+        self,
+        socket_path: Optional[Union[str, os.PathLike]] = None,
+        cache_ttl_seconds: float = 60.0,
+        session_store: Optional["SessionStore"] = None,
+        max_concurrency: int = 8,
+    ) -> None:
+        self._socket_path = pathlib.Path(
+            socket_path if socket_path is not None else default_socket_path()
+        )
+        self._cache_ttl_seconds = cache_ttl_seconds
+        self._session_store = session_store
+        self._max_concurrency = max_concurrency
+        self._lock = threading.Lock()
+        # Keyed by (Mailman base URL, list name).
+        self._clients: Dict[Tuple[str, str], Tuple[bytes, "Noire"]] = {}
+        self._log_in_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        # Keyed by Mailman base URL, so that lists on one host share a
+        # concurrency limit.
+        self._transports: Dict[str, "Transport"] = {}
+        self._server: Optional[socketserver.ThreadingUnixStreamServer] = None
+
+    @property
+    def socket_path(self) -> pathlib.Path:
+        return self._socket_path
+
+    def serve_forever(self) -> None:
+        """
+        Listens for requests until `shutdown()` is called (or a client sends
+        the `shutdown` command).
+        """
+        # 1. Only the current user may connect to the socket.
+        self._socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        try:
+            send_request(self._socket_path, {"command": "ping"})
+            raise RuntimeError(
+                f"A noire daemon is already listening on {self._socket_path}."
+            )
+        except OSError:
+            pass
+        try:
+            os.remove(self._socket_path)
+        except FileNotFoundError:
+            pass
+        old_umask = os.umask(0o177)
+        try:
+            self._server = socketserver.ThreadingUnixStreamServer(
+                os.fspath(self._socket_path), self._make_handler()
+            )
+        finally:
+            os.umask(old_umask)
+        self._server.daemon_threads = True
+
+        # 2. Serve until shut down.
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            try:
+                os.remove(self._socket_path)
+            except FileNotFoundError:
+                pass
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            # `shutdown()` blocks until the serving loop exits, so it must not
+            # run on a request handler's thread.
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        command = request.get("command", "")
+        try:
+            if command == "ping":
+                return {"ok": True, "result": "pong"}
+            if command == "shutdown":
+                self.shutdown()
+                return {"ok": True, "result": None}
+            client = self._get_client(
+                request["base_url"], request["list"], request["password"]
+            )
+            return {
+                "ok": True,
+                "result": run_command(client, command, request.get("args", {})),
+            }
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            return {"ok": False, "error": str(ex) or type(ex).__name__}
+
+    def _get_client(
+        self, mailman_base_url: str, list_name: str, list_password: str
+    ) -> "Noire":
+        from noire.cache import ReadCache
+        from noire.noire import Noire
+        from noire.transport import Transport
+
+        key = (mailman_base_url, list_name)
+        password_digest = hashlib.sha256(list_password.encode("utf-8")).digest()
+        with self._lock:
+            log_in_lock = self._log_in_locks.setdefault(key, threading.Lock())
+
+        # Log in at most once per list, without blocking requests for other
+        # lists.
+        with log_in_lock:
+            entry = self._clients.get(key)
+            if entry is not None and hmac.compare_digest(entry[0], password_digest):
+                return entry[1]
+
+            # There is no client yet, or the request's password differs from
+            # the one the client was created with (e.g., because the list's
+            # password changed). `create_client()` only succeeds once Mailman
+            # (or a session stored with the same password) accepts the
+            # password, so only accepted passwords are kept.
+            with self._lock:
+                transport = self._transports.get(mailman_base_url)
+                if transport is None:
+                    transport = Transport(max_concurrency=self._max_concurrency)
+                    self._transports[mailman_base_url] = transport
+            cache: Optional[ReadCache] = None
+            if self._cache_ttl_seconds > 0:
+                cache = ReadCache(ttl_seconds=self._cache_ttl_seconds)
+            client = Noire.create_client(
+                list_name,
+                list_password,
+                mailman_base_url,
+                cache=cache,
+                session_store=self._session_store,
+                transport=transport,
+            )
+            self._clients[key] = (password_digest, client)
+            return client
+
+    def _make_handler(self) -> type:
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                line = self.rfile.readline(_MAX_REQUEST_BYTES)
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    response: Dict[str, Any] = {
+                        "ok": False,
+                        "error": "The request is not valid JSON.",
+                    }
+                else:
+                    response = daemon.handle_request(request)
+                self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+        return Handler
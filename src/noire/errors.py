@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Union
+
+if TYPE_CHECKING:
+    from noire.models.membership import BulkAddResults, BulkRemoveResults
+
+
+class BatchFailedError(RuntimeError):
+    """
+    Raised when some batches of a batched add or remove operation fail.
+
+    `results` holds the merged results of the batches that completed, and
+    `remaining` holds the emails in the batches that did not. To resume the
+    operation, call the same method again with `remaining`.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        results: Union[BulkAddResults, BulkRemoveResults],
+        remaining: List[str],
+    ) -> None:
+        super().__init__(message)
+        self.results = results
+        self.remaining = remaining
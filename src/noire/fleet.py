@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, TypeVar
+
+from noire.concurrency import map_concurrently
+from noire.noire import Noire
+from noire.session_store import SessionStore
+from noire.transport import Transport
+
+# Like in `noire.noire`, the models and the moderation watcher are imported
+# where they are used, so that importing this module does not load
+# BeautifulSoup or pydantic.
+if TYPE_CHECKING:
+    from noire.models.fleet import ListResult
+    from noire.models.moderation import ModerationQueueEvent, ModerationRequest
+    from noire.models.settings import GeneralOptions
+    from noire.moderation_watcher import ModerationQueueWatcher
+
+T = TypeVar("T")
+
+
+class NoireFleet:
+    """
+    Runs the same operation across many lists hosted on one Mailman instance.
+
+    All lists are accessed through `Noire` clients. At most `max_concurrency`
+    requests are sent to the Mailman host at any one time. Results are
+    reported per list; a failure on one list (including a failure to log in)
+    does not affect the others.
+    """
+
+    @classmethod
+    def create_fleet(
+        cls,
+        credentials: Dict[str, str],
+        mailman_base_url: str,
+        max_concurrency: int = 8,
+        session_store: Optional[SessionStore] = None,
+        transport: Optional[Transport] = None,
+    ) -> "NoireFleet":
+        """
+        Logs in to each list concurrently. `credentials` maps list names to
+        their admin passwords. Lists that fail to log in are kept in the fleet
+        so that their login error is reported by every operation.
+
+        All clients share one `transport`, so that its concurrency limit
+        applies to the Mailman host as a whole.
+        """
+        from noire.models.fleet import ListResult
+
+        if transport is None:
+            transport = Transport(max_concurrency=max_concurrency)
+
+        def log_in(list_name: str) -> ListResult[Noire]:
+            try:
+                client = Noire.create_client(
+                    list_name,
+                    credentials[list_name],
+                    mailman_base_url,
+                    session_store=session_store,
+                    transport=transport,
+                )
+                return ListResult(list_name=list_name, result=client)
+            except Exception as ex:  # pylint: disable=broad-exception-caught
+                return ListResult(list_name=list_name, error=ex)
+
+        outcomes = map_concurrently(log_in, list(credentials), max_concurrency)
+        clients = {}
+        login_errors = {}
+        for outcome in outcomes:
+            if outcome.result is not None:
+                clients[outcome.list_name] = outcome.result
+            else:
+                assert outcome.error is not None
+                login_errors[outcome.list_name] = outcome.error
+        return cls(clients, max_concurrency, login_errors)
+
+    def __init__(
+        self,
+        clients: Dict[str, Noire],
+        max_concurrency: int = 8,
+        login_errors: Optional[Dict[str, Exception]] = None,
+    ) -> None:
+        self._clients = clients
+        self._max_concurrency = max_concurrency
+        self._login_errors = login_errors if login_errors is not None else {}
+        # Created on the first poll.
+        self._watchers: Dict[Noire, ModerationQueueWatcher] = {}
+        self._watchers_lock = threading.Lock()
+
+    @property
+    def clients(self) -> Dict[str, Noire]:
+        """
+        The clients for the lists that were successfully logged in to.
+        """
+        return self._clients
+
+    @property
+    def login_errors(self) -> Dict[str, Exception]:
+        """
+        The lists that could not be logged in to, along with the reason.
+        """
+        return self._login_errors
+
+    def run(self, operation: Callable[[Noire], T]) -> Dict[str, ListResult[T]]:
+        """
+        Runs `operation` against every list in the fleet and returns the
+        results keyed by list name.
+        """
+        from noire.models.fleet import ListResult
+
+        def run_one(list_name: str) -> ListResult[T]:
+            try:
+                return ListResult(
+                    list_name=list_name, result=operation(self._clients[list_name])
+                )
+            except Exception as ex:  # pylint: disable=broad-exception-caught
+                return ListResult(list_name=list_name, error=ex)
+
+        results: Dict[str, ListResult[T]] = {
+            list_name: ListResult(list_name=list_name, error=error)
+            for list_name, error in self._login_errors.items()
+        }
+        outcomes = map_concurrently(run_one, list(self._clients), self._max_concurrency)
+        for outcome in outcomes:
+            results[outcome.list_name] = outcome
+        return results
+
+    def get_member_emails(self) -> Dict[str, ListResult[List[str]]]:
+        return self.run(lambda client: client.get_member_emails())
+
+    def get_moderation_requests(self) -> Dict[str, ListResult[List[ModerationRequest]]]:
+        return self.run(lambda client: client.get_moderation_requests())
+
+    def get_general_options(self) -> Dict[str, ListResult[GeneralOptions]]:
+        return self.run(lambda client: client.get_general_options())
+
+    def poll_moderation_queues(
+        self,
+    ) -> Dict[str, ListResult[List[ModerationQueueEvent]]]:
+        """
+        Returns the changes to each list's moderation queue since the previous
+        call (see `ModerationQueueWatcher`). On the first call, every held
+        message is reported.
+        """
+        from noire.moderation_watcher import ModerationQueueWatcher
+
+        with self._watchers_lock:
+            for client in self._clients.values():
+                if client not in self._watchers:
+                    self._watchers[client] = ModerationQueueWatcher(client)
+        return self.run(lambda client: self._watchers[client].poll())
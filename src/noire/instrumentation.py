@@ -0,0 +1,233 @@
+import contextvars
+import functools
+import json
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, TypeVar
+
+if TYPE_CHECKING:
+    from noire.models.instrumentation import CallStats
+
+R = TypeVar("R")
+
+
+class Observer:
+    """
+    Receives measurements from a `Noire` client. Subclass this and override the
+    methods you are interested in; the defaults do nothing.
+
+    `call` is the name of the public `Noire` method that was running (for
+    nested calls, the innermost one). Observers may be called from multiple
+    threads at once.
+    """
+
+    def on_call(self, call: str, seconds: float) -> None:
+        """
+        A public method returned (or raised) after `seconds`.
+        """
+
+    def on_request(
+        self,
+        call: str,
+        method: str,
+        url: str,
+        status_code: int,
+        bytes_received: int,
+        seconds: float,
+    ) -> None:
+        """
+        An HTTP request completed (including any retries) after `seconds`.
+        """
+
+    def on_parse(
+        self,
+        call: str,
+        parser: str,
+        tree_seconds: float,
+        extract_seconds: float,
+        model_seconds: float,
+    ) -> None:
+        """
+        A page was parsed by `parser` (a function in `noire.parsers`).
+        `tree_seconds` is the time spent building the HTML tree,
+        `extract_seconds` is the time spent walking it (or scanning the page)
+        and `model_seconds` is the time spent constructing models.
+        """
+
+
+class StatsCollector(Observer):
+    """
+    An `Observer` that aggregates the measurements per public method in
+    memory.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: Dict[str, "CallStats"] = {}
+
+    def on_call(self, call: str, seconds: float) -> None:
+        with self._lock:
+            stats = self._get(call)
+            stats.calls += 1
+            stats.total_seconds += seconds
+
+    def on_request(
+        self,
+        call: str,
+        method: str,
+        url: str,
+        status_code: int,
+        bytes_received: int,
+        seconds: float,
+    ) -> None:
+        with self._lock:
+            stats = self._get(call)
+            stats.requests += 1
+            stats.bytes_received += bytes_received
+            stats.http_seconds += seconds
+
+    def on_parse(
+        self,
+        call: str,
+        parser: str,
+        tree_seconds: float,
+        extract_seconds: float,
+        model_seconds: float,
+    ) -> None:
+        with self._lock:
+            stats = self._get(call)
+            stats.parses += 1
+            stats.tree_seconds += tree_seconds
+            stats.extract_seconds += extract_seconds
+            stats.model_seconds += model_seconds
+
+    def summary(self) -> Dict[str, "CallStats"]:
+        """
+        Returns a copy of the statistics collected so far, keyed by method.
+        """
+        with self._lock:
+            return {call: stats.model_copy() for call, stats in self._stats.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {call: stats.model_dump() for call, stats in self.summary().items()},
+            indent=2,
+            sort_keys=True,
+        )
+
+    def format_table(self) -> str:
+        """
+        Formats the statistics as a text table, slowest methods first.
+        """
+        header = (
+            f"{'method':<42} {'calls':>6} {'total s':>9} {'reqs':>6} "
+            f"{'KiB':>9} {'http s':>9} {'tree s':>9} {'extract s':>9} "
+            f"{'models s':>9}"
+        )
+        lines: List[str] = [header, "-" * len(header)]
+        for call, stats in sorted(
+            self.summary().items(), key=lambda item: -item[1].total_seconds
+        ):
+            lines.append(
+                f"{call:<42} {stats.calls:>6} {stats.total_seconds:>9.3f} "
+                f"{stats.requests:>6} {stats.bytes_received / 1024:>9.1f} "
+                f"{stats.http_seconds:>9.3f} {stats.tree_seconds:>9.3f} "
+                f"{stats.extract_seconds:>9.3f} {stats.model_seconds:>9.3f}"
+            )
+        return "\n".join(lines)
+
+    def _get(self, call: str) -> "CallStats":
+        # Imported here so that clients without an observer do not load
+        # pydantic.
+        from noire.models.instrumentation import CallStats
+
+        stats = self._stats.get(call)
+        if stats is None:
+            stats = CallStats()
+            self._stats[call] = stats
+        return stats
+
+
+class CallScope:
+    """
+    The public method that is running, and where to report its measurements.
+    """
+
+    def __init__(self, observer: Observer, call: str) -> None:
+        self.observer = observer
+        self.call = call
+
+
+# Set while an instrumented client method runs. `map_concurrently()` carries
+# it over to worker threads.
+_current_scope: contextvars.ContextVar[Optional[CallScope]] = contextvars.ContextVar(
+    "noire_call_scope", default=None
+)
+# Accumulates the tree building and model construction time of the parser
+# that is running, in that order.
+_parse_seconds: contextvars.ContextVar[Optional[List[float]]] = contextvars.ContextVar(
+    "noire_parse_seconds", default=None
+)
+
+
+def current_scope() -> Optional[CallScope]:
+    return _current_scope.get()
+
+
+def enter_scope(scope: CallScope) -> contextvars.Token:
+    return _current_scope.set(scope)
+
+
+def exit_scope(token: contextvars.Token) -> None:
+    _current_scope.reset(token)
+
+
+def timed_parser(parser: Callable[..., R]) -> Callable[..., R]:
+    """
+    Reports the time spent in `parser` to the current scope's observer. When
+    no observer is set, this only costs a context variable lookup.
+    """
+
+    @functools.wraps(parser)
+    def wrapper(*args: Any, **kwargs: Any) -> R:
+        scope = _current_scope.get()
+        if scope is None:
+            return parser(*args, **kwargs)
+        parse_seconds = [0.0, 0.0]
+        token = _parse_seconds.set(parse_seconds)
+        start = time.perf_counter()
+        try:
+            return parser(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            _parse_seconds.reset(token)
+            tree_seconds, model_seconds = parse_seconds
+            scope.observer.on_parse(
+                scope.call,
+                parser.__name__,
+                tree_seconds,
+                elapsed - tree_seconds - model_seconds,
+                model_seconds,
+            )
+
+    return wrapper
+
+
+def record_tree_seconds(seconds: float) -> None:
+    parse_seconds = _parse_seconds.get()
+    if parse_seconds is not None:
+        parse_seconds[0] += seconds
+
+
+def record_model_seconds(seconds: float) -> None:
+    parse_seconds = _parse_seconds.get()
+    if parse_seconds is not None:
+        parse_seconds[1] += seconds
+
+
+def is_timing_parsers() -> bool:
+    return _parse_seconds.get() is not None
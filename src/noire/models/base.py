@@ -0,0 +1,23 @@
+import time
+from typing import Any
+
+from pydantic import BaseModel
+
+from noire.instrumentation import is_timing_parsers, record_model_seconds
+
+
+class TimedModel(BaseModel):
+    """
+    The base of the models that parsers construct. While a parser is being
+    timed (see `noire.instrumentation.timed_parser()`), the time spent
+    constructing these models is reported separately from the rest of the
+    parser's extraction time.
+    """
+
+    def __init__(self, /, **data: Any) -> None:
+        if not is_timing_parsers():
+            super().__init__(**data)
+            return
+        start = time.perf_counter()
+        super().__init__(**data)
+        record_model_seconds(time.perf_counter() - start)
@@ -0,0 +1,22 @@
+from typing import Generic, Optional, TypeVar
+from pydantic import BaseModel, ConfigDict
+
+T = TypeVar("T")
+
+
+class ListResult(BaseModel, Generic[T]):
+    """
+    The outcome of running an operation against one list in a fleet. Exactly
+    one of `result` and `error` is meaningful: if the operation (or logging in
+    to the list) raised, `error` holds the exception.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    list_name: str
+    result: Optional[T] = None
+    error: Optional[Exception] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
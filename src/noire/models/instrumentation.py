@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+
+
+class CallStats(BaseModel):
+    """
+    Aggregated measurements for one public `Noire` method.
+    """
+
+    # How many times the method was called, and the total wall time.
+    calls: int = 0
+    total_seconds: float = 0.0
+
+    # HTTP requests sent on behalf of the method.
+    requests: int = 0
+    bytes_received: int = 0
+    http_seconds: float = 0.0
+
+    # Pages parsed on behalf of the method. `tree_seconds` is the time spent
+    # building HTML trees, `extract_seconds` is the time spent walking them (or
+    # scanning the pages) and `model_seconds` is the time spent constructing
+    # models.
+    parses: int = 0
+    tree_seconds: float = 0.0
+    extract_seconds: float = 0.0
+    model_seconds: float = 0.0
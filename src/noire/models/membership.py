@@ -1,23 +1,49 @@
-from typing import List, Optional, Dict
+import itertools
+from typing import Dict, Iterable, Iterator, List, Optional
 from urllib.parse import quote
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
+from noire.models.base import TimedModel
 
-class MemberError(BaseModel):
+
+class MemberError(TimedModel):
     email: str
     error_reason: Optional[str]
 
 
-class BulkAddResults(BaseModel):
+class BulkAddResults(TimedModel):
     added: List[str]
     errors: List[MemberError]
 
+    @classmethod
+    def merge(cls, results: List["BulkAddResults"]) -> "BulkAddResults":
+        return BulkAddResults(
+            added=[email for result in results for email in result.added],
+            errors=[error for result in results for error in result.errors],
+        )
+
 
-class BulkRemoveResults(BaseModel):
+class BulkRemoveResults(TimedModel):
     removed: List[str]
 
+    @classmethod
+    def merge(cls, results: List["BulkRemoveResults"]) -> "BulkRemoveResults":
+        return BulkRemoveResults(
+            removed=[email for result in results for email in result.removed],
+        )
 
-class MemberSettings(BaseModel):
+
+class SyncResults(BaseModel):
+    """
+    What changed when synchronizing the membership list. Members that were
+    already subscribed (and should be) do not appear here.
+    """
+
+    add_results: BulkAddResults
+    remove_results: BulkRemoveResults
+
+
+class MemberSettings(TimedModel):
     # The member's email address.
     email: str
 
@@ -55,6 +81,9 @@ class MemberSettings(BaseModel):
             plain=setting_enabled["plain"],
         )
 
+    def with_changes(self, changes: "MemberSettingsChanges") -> "MemberSettings":
+        return self.model_copy(update=changes.model_dump(exclude_none=True))
+
     def to_html_values(self) -> Dict[str, str]:
         email = quote(self.email)
         values = {
@@ -77,3 +106,188 @@ class MemberSettings(BaseModel):
         if self.plain:
             values[f"{email}_plain"] = "on"
         return values
+
+
+class MemberSettingsChanges(BaseModel):
+    """
+    Used to make changes to members' subscription settings. Set a value to
+    indicate that it should be modified; the other settings are left as they
+    are. Mailman's form needs every setting of each submitted member, so
+    `Noire.change_member_subscription_settings()` still fetches the members'
+    current settings (unless they are passed in) and sends all of them for the
+    members that change.
+    """
+
+    moderated: Optional[bool] = None
+    hide: Optional[bool] = None
+    no_mail: Optional[bool] = None
+    ack: Optional[bool] = None
+    not_me_too: Optional[bool] = None
+    no_dupes: Optional[bool] = None
+    digest: Optional[bool] = None
+    plain: Optional[bool] = None
+
+
+# The member settings flags, in the order of their bits in a
+# `MemberSettingsTable`, along with the names Mailman uses for them in HTML.
+MEMBER_SETTINGS_FLAGS = (
+    ("moderated", "mod"),
+    ("hide", "hide"),
+    ("no_mail", "nomail"),
+    ("ack", "ack"),
+    ("not_me_too", "notmetoo"),
+    ("no_dupes", "nodupes"),
+    ("digest", "digest"),
+    ("plain", "plain"),
+)
+_FLAG_BITS = {field: 1 << bit for bit, (field, _) in enumerate(MEMBER_SETTINGS_FLAGS)}
+_HTML_FLAG_BITS = {
+    html_name: 1 << bit for bit, (_, html_name) in enumerate(MEMBER_SETTINGS_FLAGS)
+}
+
+
+class MemberSettingsTable:
+    """
+    A compact, columnar alternative to `List[MemberSettings]` for large lists.
+
+    Each member takes one string (their email) and one byte (their eight
+    settings flags, packed in the order of `MEMBER_SETTINGS_FLAGS`).
+    `MemberSettings` objects are only created when requested.
+    """
+
+    def __init__(self) -> None:
+        self._emails: List[str] = []
+        self._flags = bytearray()
+        # Built on the first lookup by email.
+        self._index: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def from_member_settings(
+        cls, settings: Iterable[MemberSettings]
+    ) -> "MemberSettingsTable":
+        table = cls()
+        for setting in settings:
+            table.append(
+                setting.email,
+                sum(
+                    bit for field, bit in _FLAG_BITS.items() if getattr(setting, field)
+                ),
+            )
+        return table
+
+    def to_member_settings(self) -> List[MemberSettings]:
+        return list(self)
+
+    def append(self, email: str, flags: int) -> None:
+        """
+        Adds a member. `flags` holds the member's settings as bits (see
+        `MEMBER_SETTINGS_FLAGS`).
+        """
+        self._emails.append(email)
+        self._flags.append(flags)
+        self._index = None
+
+    def append_html_values(self, email: str, setting_enabled: Dict[str, bool]) -> None:
+        """
+        Adds a member from settings keyed by their Mailman HTML names (see
+        `MemberSettings.from_html_values()`).
+        """
+        self.append(
+            email,
+            sum(
+                _HTML_FLAG_BITS[name]
+                for name, enabled in setting_enabled.items()
+                if enabled and name in _HTML_FLAG_BITS
+            ),
+        )
+
+    def extend(self, other: "MemberSettingsTable") -> None:
+        # pylint: disable=protected-access
+        self._emails.extend(other._emails)
+        self._flags.extend(other._flags)
+        self._index = None
+
+    @property
+    def emails(self) -> List[str]:
+        return list(self._emails)
+
+    def __len__(self) -> int:
+        return len(self._emails)
+
+    def __iter__(self) -> Iterator[MemberSettings]:
+        for i in range(len(self._emails)):
+            yield self[i]
+
+    def __getitem__(self, i: int) -> MemberSettings:
+        flags = self._flags[i]
+        return MemberSettings(
+            email=self._emails[i],
+            **{field: bool(flags & bit) for field, bit in _FLAG_BITS.items()},
+        )
+
+    def __contains__(self, email: object) -> bool:
+        return email in self._get_index()
+
+    def get(self, email: str) -> Optional[MemberSettings]:
+        """
+        Returns the member's settings, or None if they are not in the table.
+        """
+        i = self._get_index().get(email)
+        return None if i is None else self[i]
+
+    def filter(self, **flags: bool) -> "MemberSettingsTable":
+        """
+        Returns the members whose settings match all of the given flags (e.g.,
+        `table.filter(moderated=True, digest=True)`).
+        """
+        matches = self._matches(flags)
+        result = MemberSettingsTable()
+        # pylint: disable=protected-access
+        result._emails = list(itertools.compress(self._emails, matches))
+        result._flags = bytearray(itertools.compress(self._flags, matches))
+        return result
+
+    def count(self, **flags: bool) -> int:
+        """
+        Returns the number of members whose settings match all of the given
+        flags.
+        """
+        return self._matches(flags).count(1)
+
+    def _matches(self, flags: Dict[str, bool]) -> bytearray:
+        # Maps each member's flags byte to 1 if it matches and 0 otherwise. The
+        # mapping runs in C via `bytes.translate()`.
+        mask = 0
+        expected = 0
+        for field, value in flags.items():
+            if field not in _FLAG_BITS:
+                raise ValueError(f"Unknown member setting {field}")
+            mask |= _FLAG_BITS[field]
+            if value:
+                expected |= _FLAG_BITS[field]
+        lookup = bytes(1 if byte & mask == expected else 0 for byte in range(256))
+        return self._flags.translate(lookup)
+
+    def _get_index(self) -> Dict[str, int]:
+        if self._index is None:
+            self._index = {email: i for i, email in enumerate(self._emails)}
+        return self._index
+
+
+class MembersPage(TimedModel):
+    """
+    One page of the membership list. When a list has more members than its
+    "admin_member_chunksize", Mailman groups the members by the first letter of
+    their address and splits each letter into chunks of that size.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    members: MemberSettingsTable
+    # The letters that the membership list is split into. This is empty if all
+    # members fit on one page.
+    letters: List[str]
+    # The letter shown on this page (if the list is split into letters).
+    current_letter: Optional[str]
+    # The other chunks of the current letter (chunk 0 is the first).
+    chunks: List[int]
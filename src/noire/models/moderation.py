@@ -1,9 +1,12 @@
 import enum
 from datetime import datetime
+from typing import List, Optional
 from pydantic import BaseModel
 
+from noire.models.base import TimedModel
 
-class ModerationRequest(BaseModel):
+
+class ModerationRequest(TimedModel):
     message_id: int
     sender_email: str
     subject: str
@@ -12,7 +15,7 @@ class ModerationRequest(BaseModel):
     received_date: datetime
 
 
-class ModerationRequestDetails(BaseModel):
+class ModerationRequestDetails(TimedModel):
     message_id: int
     message_contents: str
     message_headers: str
@@ -27,3 +30,37 @@ class ModerationAction(enum.Enum):
     Approve = 1
     Reject = 2
     Discard = 3
+
+
+class ModerationDecision(BaseModel):
+    """
+    A moderation action to apply to one held message, along with its options.
+    See `Noire.apply_moderation_action()` for a description of the options.
+    """
+
+    action: ModerationAction
+    rejection_message: Optional[str] = None
+    preserve_message_for_admin: bool = False
+    forward_message_to_list_owner: bool = False
+
+
+class BatchModerationResults(BaseModel):
+    # Messages that are no longer held for moderation.
+    resolved: List[int]
+    # Messages that are still held for moderation (e.g., deferred messages).
+    unresolved: List[int]
+
+
+class ModerationQueueEventKind(enum.Enum):
+    # A message is newly held for moderation.
+    Held = "held"
+    # A message is no longer held for moderation (it was approved, rejected or
+    # discarded).
+    Resolved = "resolved"
+
+
+class ModerationQueueEvent(BaseModel):
+    kind: ModerationQueueEventKind
+    message_id: int
+    # The held message. This is only set for `Held` events.
+    request: Optional[ModerationRequest] = None
@@ -1,8 +1,10 @@
 from typing import Optional
 from pydantic import BaseModel
 
+from noire.models.base import TimedModel
 
-class GeneralOptions(BaseModel):
+
+class GeneralOptions(TimedModel):
     """
     Settings found on Mailman's "General Options" page.
 
@@ -27,8 +29,10 @@ class GeneralOptions(BaseModel):
 class GeneralOptionsChanges(BaseModel):
     """
     Used to make changes to Mailman's "General Options". Set a value to indicate
-    that it should be modified. This allows for setting changes without fetching
-    all the existing options.
+    that it should be modified; the other options are left as they are.
+    `Noire.set_general_options()` compares the changes with the current options
+    (which it fetches, unless they are passed in) and only submits the ones that
+    differ.
     """
 
     send_reminders: Optional[bool] = None
@@ -41,3 +45,21 @@ class GeneralOptionsChanges(BaseModel):
     respond_to_post_requests: Optional[bool] = None
 
     admin_member_chunksize: Optional[int] = None
+
+    def without_current_values(
+        self, current: GeneralOptions
+    ) -> "GeneralOptionsChanges":
+        """
+        Returns a copy that leaves out the options that are already set to
+        their requested value in `current`.
+        """
+        return GeneralOptionsChanges(
+            **{
+                field: value
+                for field, value in self.model_dump(exclude_none=True).items()
+                if getattr(current, field) != value
+            }
+        )
+
+    def is_empty(self) -> bool:
+        return len(self.model_dump(exclude_none=True)) == 0
@@ -0,0 +1,79 @@
+import threading
+from typing import Dict, Iterator, List, Optional
+
+from noire.models.moderation import (
+    ModerationQueueEvent,
+    ModerationQueueEventKind,
+    ModerationRequest,
+)
+from noire.noire import Noire
+
+
+class ModerationQueueWatcher:
+    """
+    Polls a list's moderation queue and reports only what changed since the
+    previous poll: messages that are newly held and messages that were
+    resolved.
+
+    The watcher remembers a hash of the last moderation page it saw. If the
+    page is unchanged, a poll does not parse it at all.
+    """
+
+    def __init__(self, client: Noire) -> None:
+        self._client = client
+        self._last_page_hash: Optional[bytes] = None
+        self._held: Dict[int, ModerationRequest] = {}
+
+    @property
+    def held(self) -> List[ModerationRequest]:
+        """
+        The messages that were held for moderation as of the last poll.
+        """
+        return list(self._held.values())
+
+    def poll(self) -> List[ModerationQueueEvent]:
+        """
+        Fetches the moderation queue and returns the changes since the last
+        poll. On the first poll, every held message is reported as `Held`.
+        """
+        page_hash, requests = self._client.get_moderation_requests_if_changed(
+            self._last_page_hash
+        )
+        if requests is None:
+            return []
+
+        held = {request.message_id: request for request in requests}
+        events = [
+            ModerationQueueEvent(
+                kind=ModerationQueueEventKind.Resolved, message_id=message_id
+            )
+            for message_id in self._held
+            if message_id not in held
+        ]
+        events.extend(
+            ModerationQueueEvent(
+                kind=ModerationQueueEventKind.Held,
+                message_id=message_id,
+                request=request,
+            )
+            for message_id, request in held.items()
+            if message_id not in self._held
+        )
+        self._held = held
+        self._last_page_hash = page_hash
+        return events
+
+    def watch(
+        self,
+        interval_seconds: float = 30.0,
+        stop: Optional[threading.Event] = None,
+    ) -> Iterator[ModerationQueueEvent]:
+        """
+        Polls the moderation queue every `interval_seconds` and yields each
+        change as it is found. This runs until `stop` is set (if provided).
+        """
+        if stop is None:
+            stop = threading.Event()
+        while not stop.is_set():
+            yield from self.poll()
+            stop.wait(interval_seconds)
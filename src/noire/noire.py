@@ -1,5 +1,26 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import math
+import re
+import threading
+import time
 import requests
-from typing import List, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 from noire.constants import (
     LOG_IN_URL_TEMPLATE,
@@ -13,24 +34,132 @@ from noire.constants import (
     GENERAL_SETTINGS_URL_TEMPLATE,
     ROSTER_URL_TEMPLATE,
 )
-from noire.models.membership import BulkAddResults, BulkRemoveResults, MemberSettings
-from noire.models.moderation import (
-    ModerationRequest,
-    ModerationRequestDetails,
-    ModerationAction,
-)
-from noire.models.settings import GeneralOptions, GeneralOptionsChanges
-from noire.parsers.members_list import (
-    extract_emails_from_roster,
-    extract_add_results,
-    extract_remove_results,
-    extract_member_settings,
+from noire.cache import ReadCache
+from noire.instrumentation import (
+    CallScope,
+    Observer,
+    current_scope,
+    enter_scope,
+    exit_scope,
 )
-from noire.parsers.moderation import (
-    extract_moderation_requests,
-    extract_moderation_post_details,
-)
-from noire.parsers.settings import extract_general_options
+from noire.concurrency import iter_concurrently, map_concurrently
+from noire.session_store import SessionStore
+from noire.transport import Transport
+
+# The models and parsers are imported where they are used, so that importing
+# this module does not load BeautifulSoup, pydantic or models that a script
+# never uses.
+if TYPE_CHECKING:
+    from noire.models.membership import (
+        BulkAddResults,
+        BulkRemoveResults,
+        MemberSettings,
+        MemberSettingsChanges,
+        MemberSettingsTable,
+        MembersPage,
+        SyncResults,
+    )
+    from noire.models.moderation import (
+        BatchModerationResults,
+        ModerationDecision,
+        ModerationRequest,
+        ModerationRequestDetails,
+        ModerationAction,
+    )
+    from noire.models.settings import GeneralOptions, GeneralOptionsChanges
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Mailman serves its login form in place of an admin page when the session is
+# not (or no longer) valid.
+_LOG_IN_FORM = re.compile(rb'<input[^>]+name="adminpw"', re.IGNORECASE)
+
+# Newer Mailman 2.1 releases embed a per-request CSRF token in the page's
+# forms. It changes on every request, so it is left out of page hashes.
+_CSRF_TOKEN = re.compile(rb'name="csrf_token"\s+value="[^"]*"', re.IGNORECASE)
+
+LOG_IN_TIMEOUT_SECONDS = 60.0
+
+# The number of held messages' details to keep in memory per client.
+MODERATION_DETAILS_CACHE_SIZE = 512
+
+# The number of membership pages to fetch concurrently when a write method
+# fetches the current member settings itself.
+_CURRENT_SETTINGS_MAX_WORKERS = 8
+
+
+def _instrumented(method: Callable[..., R]) -> Callable[..., R]:
+    """
+    Marks a public `Noire` method. If the client has an observer, the method's
+    requests and parsing are attributed to it (see `noire.instrumentation`).
+    """
+    name = method.__name__
+
+    if inspect.isgeneratorfunction(method):
+
+        @functools.wraps(method)
+        def generator_wrapper(self: "Noire", *args: Any, **kwargs: Any) -> Any:
+            # pylint: disable-next=protected-access
+            observer = self._observer
+            if observer is None:
+                return (yield from method(self, *args, **kwargs))
+            # The scope can only be entered while the generator runs, so it is
+            # re-entered each time the generator resumes.
+            scope = CallScope(observer, name)
+            generator = method(self, *args, **kwargs)
+            elapsed = 0.0
+            try:
+                while True:
+                    token = enter_scope(scope)
+                    start = time.perf_counter()
+                    try:
+                        item = next(generator)
+                    except StopIteration as stop:
+                        return stop.value
+                    finally:
+                        elapsed += time.perf_counter() - start
+                        exit_scope(token)
+                    yield item
+            finally:
+                observer.on_call(name, elapsed)
+
+        return generator_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self: "Noire", *args: Any, **kwargs: Any) -> R:
+        # pylint: disable-next=protected-access
+        observer = self._observer
+        if observer is None:
+            return method(self, *args, **kwargs)
+        token = enter_scope(CallScope(observer, name))
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            observer.on_call(name, time.perf_counter() - start)
+            exit_scope(token)
+
+    return wrapper
+
+
+def _invalidates_cache(method: Callable[..., R]) -> Callable[..., R]:
+    """
+    Marks a `Noire` method that modifies the list. The cache is cleared once
+    the method returns (or raises), since the request may have been applied.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: "Noire", *args: Any, **kwargs: Any) -> R:
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            # pylint: disable-next=protected-access
+            cache = self._cache
+            if cache is not None:
+                cache.invalidate()
+
+    return wrapper
 
 
 class Noire:
@@ -46,23 +175,44 @@ class Noire:
         list_name: str,
         list_password: str,
         mailman_base_url: str,
+        session: Optional[requests.Session] = None,
+        cache: Optional[ReadCache] = None,
+        session_store: Optional[SessionStore] = None,
+        transport: Optional[Transport] = None,
+        observer: Optional[Observer] = None,
     ) -> "Noire":
-        session = requests.Session()
-        log_in_data = {
-            "adminpw": list_password,
-        }
-        log_in_url = LOG_IN_URL_TEMPLATE.format(
-            list_name=list_name, mailman_base_url=mailman_base_url
-        )
-        response = session.post(log_in_url, data=log_in_data)
-        if response.status_code == 401:
-            raise RuntimeError(f"Incorrect password for list {list_name}")
-        elif response.status_code != 200:
-            raise RuntimeError(
-                f"Error authenticating to list {list_name}: {response.status_code}"
-            )
+        """
+        Logs in to the list and returns a client for it.
+
+        If a `session_store` is provided, a previously stored session is
+        reused instead of logging in, and new sessions are stored in it. A
+        stored session is only reused if it was created with `list_password`;
+        otherwise the client logs in (which checks the password).
 
-        return cls(list_name, mailman_base_url, list_password, session)
+        Requests are sent through `transport` (see `Transport`), which handles
+        timeouts, retries and concurrency limits. Clients that talk to the same
+        Mailman host can share one transport.
+
+        If an `observer` is provided, it receives timing measurements for each
+        call (see `noire.instrumentation`).
+        """
+        if session is None:
+            session = requests.Session()
+        client = cls(
+            list_name,
+            mailman_base_url,
+            list_password,
+            session,
+            cache,
+            session_store,
+            transport,
+            observer,
+        )
+        if session_store is None or not session_store.load(
+            mailman_base_url, list_name, list_password, session.cookies
+        ):
+            client._log_in()
+        return client
 
     def __init__(
         self,
@@ -70,41 +220,144 @@ class Noire:
         mailman_base_url: str,
         list_password: str,
         session: requests.Session,
+        cache: Optional[ReadCache] = None,
+        session_store: Optional[SessionStore] = None,
+        transport: Optional[Transport] = None,
+        observer: Optional[Observer] = None,
     ) -> None:
         self._list_name = list_name
         self._mailman_base_url = mailman_base_url
         self._list_password = list_password
         self._session = session
+        self._transport = transport if transport is not None else Transport()
+        # Caches the results of read methods, if set. Methods that modify the
+        # list must clear it (see `_invalidates_cache`).
+        self._cache = cache
+        # A held message's contents never change, so its details can be cached
+        # until a moderation action is applied to it.
+        self._moderation_details_cache = ReadCache(
+            ttl_seconds=math.inf, max_entries=MODERATION_DETAILS_CACHE_SIZE
+        )
+        self._session_store = session_store
+        self._observer = observer
+        self._log_in_lock = threading.Lock()
+        self._session.hooks["response"].append(self._reauthenticate_if_needed)
+
+    def _log_in(self) -> None:
+        log_in_data = {
+            "adminpw": self._list_password,
+        }
+        log_in_url = LOG_IN_URL_TEMPLATE.format(
+            list_name=self._list_name, mailman_base_url=self._mailman_base_url
+        )
+        # This bypasses the transport because it may run inside a request that
+        # the transport is already sending (see `_reauthenticate_if_needed()`).
+        response = self._session.post(
+            log_in_url, data=log_in_data, timeout=LOG_IN_TIMEOUT_SECONDS
+        )
+        if response.status_code == 401:
+            raise RuntimeError(f"Incorrect password for list {self._list_name}")
+        elif response.status_code != 200:
+            raise RuntimeError(
+                f"Error authenticating to list {self._list_name}: {response.status_code}"
+            )
+        if self._session_store is not None:
+            self._session_store.save(
+                self._mailman_base_url,
+                self._list_name,
+                self._list_password,
+                self._session.cookies,
+            )
 
+    def _reauthenticate_if_needed(
+        self, response: requests.Response, **kwargs: Any
+    ) -> requests.Response:
+        """
+        A response hook that detects when Mailman has rejected our session
+        (e.g., because the cookie expired) and sent back its login page. When
+        this happens, we log in again and retry the request once.
+
+        Only GET requests are retried. Our POST requests include the list
+        password, so Mailman does not need a session to accept them.
+        """
+        request = response.request
+        if (
+            request.method != "GET"
+            or getattr(request, "noire_reauthenticated", False)
+            or _LOG_IN_FORM.search(response.content) is None
+        ):
+            return response
+
+        with self._log_in_lock:
+            self._log_in()
+        retry = request.copy()
+        retry.headers.pop("Cookie", None)
+        retry.prepare_cookies(self._session.cookies)
+        setattr(retry, "noire_reauthenticated", True)
+        return self._session.send(retry, **kwargs)
+
+    @_instrumented
     def get_member_emails(self) -> List[str]:
         """
         Retrieves all emails that are subscribed to the list.
         """
+        return list(self._cached("member_emails", self._fetch_member_emails))
+
+    def _fetch_member_emails(self) -> List[str]:
+        from noire.parsers.members_list import extract_emails_from_roster
+
         get_url = ROSTER_URL_TEMPLATE.format(
             list_name=self._list_name, mailman_base_url=self._mailman_base_url
         )
-        response = self._session.get(get_url)
+        response = self._get(get_url)
         if response.status_code != 200:
             raise RuntimeError(
                 f"Unexpected error when fetching member emails: {response.status_code}"
             )
         return extract_emails_from_roster(response.content.decode())
 
+    @_instrumented
     def get_moderation_requests(self) -> List[ModerationRequest]:
         """
         Retrieves moderation requests for the list (i.e., emails sent to the
         list that are held for moderation).
         """
+        from noire.parsers.moderation import extract_moderation_requests
+
+        return extract_moderation_requests(
+            self._fetch_moderation_requests_page().decode()
+        )
+
+    @_instrumented
+    def get_moderation_requests_if_changed(
+        self, previous_page_hash: Optional[bytes]
+    ) -> Tuple[bytes, Optional[List[ModerationRequest]]]:
+        """
+        Retrieves the moderation requests, unless the moderation queue page is
+        unchanged since the fetch that returned `previous_page_hash`. Returns
+        the page's hash and the requests (or `None` if the page is unchanged,
+        in which case it is not parsed). See `ModerationQueueWatcher`.
+        """
+        from noire.parsers.moderation import extract_moderation_requests
+
+        raw_page = self._fetch_moderation_requests_page()
+        page_hash = hashlib.sha256(_CSRF_TOKEN.sub(b"", raw_page)).digest()
+        if page_hash == previous_page_hash:
+            return page_hash, None
+        return page_hash, extract_moderation_requests(raw_page.decode())
+
+    def _fetch_moderation_requests_page(self) -> bytes:
         get_url = MODERATION_REQUESTS_URL_TEMPLATE.format(
             list_name=self._list_name, mailman_base_url=self._mailman_base_url
         )
-        response = self._session.get(get_url)
+        response = self._get(get_url)
         if response.status_code != 200:
             raise RuntimeError(
                 f"Unexpected error when fetching moderation requests: {response.status_code}"
             )
-        return extract_moderation_requests(response.content.decode())
+        return response.content
 
+    @_instrumented
     def get_moderation_details(
         self, message_id: int
     ) -> Optional[ModerationRequestDetails]:
@@ -112,18 +365,46 @@ class Noire:
         Retrieves details about a message held for moderation (e.g., the
         message's contents).
         """
+        details = self._moderation_details_cache.get_or_fetch(
+            message_id, lambda: self._fetch_moderation_details(message_id)
+        )
+        if details is None:
+            # The message is not held (yet), so do not remember that.
+            self._moderation_details_cache.invalidate(message_id)
+            return None
+        # Return a copy, so that changes made by the caller do not leak into
+        # the cache.
+        return details.model_copy()
+
+    @_instrumented
+    def get_moderation_details_many(
+        self, message_ids: List[int], max_workers: int = 8
+    ) -> List[Optional[ModerationRequestDetails]]:
+        """
+        Retrieves details about many messages held for moderation, fetching up
+        to `max_workers` messages concurrently. The results are in the same
+        order as `message_ids`.
+        """
+        return map_concurrently(self.get_moderation_details, message_ids, max_workers)
+
+    def _fetch_moderation_details(
+        self, message_id: int
+    ) -> Optional[ModerationRequestDetails]:
+        from noire.parsers.moderation import extract_moderation_post_details
+
         get_url = MODERATION_DETAILS_URL_TEMPLATE.format(
             mailman_base_url=self._mailman_base_url,
             list_name=self._list_name,
             message_id=message_id,
         )
-        response = self._session.get(get_url)
+        response = self._get(get_url)
         if response.status_code != 200:
             raise RuntimeError(
                 f"Unexpected error when fetching moderation details for {message_id}: {response.status_code}"
             )
         return extract_moderation_post_details(message_id, response.content.decode())
 
+    @_instrumented
     def apply_moderation_action(
         self,
         message_id: int,
@@ -142,23 +423,78 @@ class Noire:
         sender. You can customize this reason with `rejection_message`. If you
         do not set a rejection message, Mailman will use a default message.
         """
+        from noire.models.moderation import ModerationDecision
 
         endpoint = MODERATION_REQUESTS_URL_TEMPLATE.format(
             mailman_base_url=self._mailman_base_url, list_name=self._list_name
         )
-        payload = {
+        payload: Dict[Union[str, int], Union[str, int]] = {
             "adminpw": self._list_password,
-            message_id: action.value,
         }
-        if action == ModerationAction.Reject and rejection_message is not None:
-            payload[f"comment-{message_id}"] = rejection_message
-        if preserve_message_for_admin:
-            payload[f"preserve-{message_id}"] = "on"
-        if forward_message_to_list_owner:
-            payload[f"forward-{message_id}"] = "on"
-        response = self._session.post(endpoint, payload)
+        payload.update(
+            _moderation_decision_values(
+                message_id,
+                ModerationDecision(
+                    action=action,
+                    rejection_message=rejection_message,
+                    preserve_message_for_admin=preserve_message_for_admin,
+                    forward_message_to_list_owner=forward_message_to_list_owner,
+                ),
+            )
+        )
+        response = self._post(endpoint, payload, retry=True)
+        self._moderation_details_cache.invalidate(message_id)
         return response.status_code == 200
 
+    @_instrumented
+    def apply_moderation_actions(
+        self, decisions: Dict[int, ModerationDecision], batch_size: int = 100
+    ) -> BatchModerationResults:
+        """
+        Applies moderation actions to many held messages at once. `decisions`
+        maps message IDs (from `get_moderation_requests()`) to the action to
+        apply to them.
+
+        Mailman accepts decisions for many messages in one submission, so the
+        decisions are sent in batches of at most `batch_size` messages. Like
+        the other batched writes, the batches are sent one after another:
+        Mailman processes each submission under a lock on the list, so
+        concurrent submissions would only wait for each other.
+
+        After submitting, this method re-reads the moderation queue and reports
+        which messages were resolved (i.e., are no longer held).
+        """
+        from noire.models.moderation import BatchModerationResults
+
+        if batch_size < 1:
+            raise ValueError("The batch size must be at least 1.")
+        endpoint = MODERATION_REQUESTS_URL_TEMPLATE.format(
+            mailman_base_url=self._mailman_base_url, list_name=self._list_name
+        )
+        message_ids = list(decisions.keys())
+        for start in range(0, len(message_ids), batch_size):
+            payload: Dict[Union[str, int], Union[str, int]] = {
+                "adminpw": self._list_password,
+            }
+            for message_id in message_ids[start : start + batch_size]:
+                payload.update(
+                    _moderation_decision_values(message_id, decisions[message_id])
+                )
+            # A failed submission shows up as unresolved messages below.
+            self._post(endpoint, payload, retry=True)
+        self._moderation_details_cache.invalidate(*message_ids)
+
+        still_held = {request.message_id for request in self.get_moderation_requests()}
+        return BatchModerationResults(
+            resolved=[
+                message_id for message_id in message_ids if message_id not in still_held
+            ],
+            unresolved=[
+                message_id for message_id in message_ids if message_id in still_held
+            ],
+        )
+
+    @_instrumented
     def add_members(
         self,
         emails: List[str],
@@ -175,19 +511,63 @@ class Noire:
         - send_owner_notifications:  Send an email to the list owner about the new
                                      members.
         """
-        endpoint = ADD_MEMBERS_URL_TEMPLATE.format(
-            mailman_base_url=self._mailman_base_url, list_name=self._list_name
+        from noire.parsers.members_list import extract_add_results
+
+        response = self._post_add_members(
+            emails, send_welcome_message, send_owner_notifications
         )
-        payload = {
-            "adminpw": self._list_password,
-            "subscribees": "\n".join(emails),
-            "subscribe_or_invite": 0,  # 0 indicates subscribe.
-            "send_welcome_msg_to_this_batch": 1 if send_welcome_message else 0,
-            "send_notifications_to_list_owner": 1 if send_owner_notifications else 0,
-        }
-        response = self._session.post(endpoint, payload)
         return extract_add_results(response.content.decode())
 
+    @_instrumented
+    def add_members_in_batches(
+        self,
+        emails: List[str],
+        batch_size: int = 500,
+        max_workers: int = 1,
+        send_welcome_message: bool = False,
+        send_owner_notifications: bool = False,
+    ) -> BulkAddResults:
+        """
+        Subscribes the given emails to the list, like `add_members()`, but
+        sends them in batches of at most `batch_size` emails with up to
+        `max_workers` batches in flight. Returns the merged results of all
+        batches.
+
+        Mailman handles each submission under a lock on the list, so by
+        default the batches are sent one after another (see
+        `apply_moderation_actions()`). A larger `max_workers` only overlaps
+        the batches' network transfers.
+
+        If any batch fails, this method raises a `BatchFailedError` once the
+        other batches finish. The error holds the results of the batches that
+        completed and the emails that still need to be added; pass
+        `error.remaining` to this method to resume.
+        """
+        from noire.errors import BatchFailedError
+        from noire.models.membership import BulkAddResults
+        from noire.parsers.members_list import extract_add_results
+
+        def add_batch(batch: List[str]) -> BulkAddResults:
+            response = self._post_add_members(
+                batch, send_welcome_message, send_owner_notifications
+            )
+            if response.status_code != 200:
+                raise RuntimeError(
+                    f"Unexpected error when adding members: {response.status_code}"
+                )
+            return extract_add_results(response.content.decode())
+
+        results, remaining, error = _run_batches(
+            add_batch, emails, batch_size, max_workers
+        )
+        merged = BulkAddResults.merge(results)
+        if error is not None:
+            raise BatchFailedError(
+                f"Failed to add {len(remaining)} member(s): {error}", merged, remaining
+            ) from error
+        return merged
+
+    @_instrumented
     def remove_members(
         self,
         emails: List[str],
@@ -203,20 +583,64 @@ class Noire:
         - send_owner_notifications: Send an email to the list owner about the removed
                                     members.
         """
-        endpoint = REMOVE_MEMBERS_URL_TEMPLATE.format(
-            mailman_base_url=self._mailman_base_url, list_name=self._list_name
+        from noire.parsers.members_list import extract_remove_results
+
+        response = self._post_remove_members(
+            emails, send_unsubscribe_message, send_owner_notifications
         )
-        payload = {
-            "adminpw": self._list_password,
-            "unsubscribees": "\n".join(emails),
-            "send_unsub_ack_to_this_batch": 1 if send_unsubscribe_message else 0,
-            "send_unsub_notifications_to_list_owner": 1
-            if send_owner_notifications
-            else 0,
-        }
-        response = self._session.post(endpoint, payload)
         return extract_remove_results(response.content.decode())
 
+    @_instrumented
+    def remove_members_in_batches(
+        self,
+        emails: List[str],
+        batch_size: int = 500,
+        max_workers: int = 1,
+        send_unsubscribe_message: bool = False,
+        send_owner_notifications: bool = False,
+    ) -> BulkRemoveResults:
+        """
+        Unsubscribes the given emails from the list, like `remove_members()`,
+        but sends them in batches of at most `batch_size` emails with up to
+        `max_workers` batches in flight. Returns the merged results of all
+        batches.
+
+        The batches are sent one after another by default, as in
+        `add_members_in_batches()`.
+
+        If any batch fails, this method raises a `BatchFailedError` once the
+        other batches finish. The error holds the results of the batches that
+        completed and the emails that still need to be removed; pass
+        `error.remaining` to this method to resume.
+        """
+        from noire.errors import BatchFailedError
+        from noire.models.membership import BulkRemoveResults
+        from noire.parsers.members_list import extract_remove_results
+
+        def remove_batch(batch: List[str]) -> BulkRemoveResults:
+            response = self._post_remove_members(
+                batch, send_unsubscribe_message, send_owner_notifications
+            )
+            if response.status_code != 200:
+                raise RuntimeError(
+                    f"Unexpected error when removing members: {response.status_code}"
+                )
+            return extract_remove_results(response.content.decode())
+
+        results, remaining, error = _run_batches(
+            remove_batch, emails, batch_size, max_workers
+        )
+        merged = BulkRemoveResults.merge(results)
+        if error is not None:
+            raise BatchFailedError(
+                f"Failed to remove {len(remaining)} member(s): {error}",
+                merged,
+                remaining,
+            ) from error
+        return merged
+
+    @_instrumented
+    @_invalidates_cache
     def sync_members(self, emails: List[str]) -> bool:
         """
         Synchronizes the member list with the provided list of emails.
@@ -232,9 +656,60 @@ class Noire:
             "adminpw": self._list_password,
             "memberlist": "\n".join(emails),
         }
-        response = self._session.post(endpoint, payload)
+        response = self._post(endpoint, payload, retry=True)
         return response.status_code == 200
 
+    @_instrumented
+    def sync_members_by_diff(
+        self,
+        emails: List[str],
+        batch_size: int = 500,
+        max_workers: int = 1,
+        send_welcome_message: bool = False,
+        send_unsubscribe_message: bool = False,
+        send_owner_notifications: bool = False,
+    ) -> SyncResults:
+        """
+        Synchronizes the member list with the provided list of emails, like
+        `sync_members()`, but computes the difference on the client.
+
+        This method fetches the current members (bypassing the read cache, so
+        that changes made by others are not missed), then only subscribes the
+        emails that are missing and only unsubscribes the members that should
+        not be on the list. The changes are sent in batches of at most
+        `batch_size` emails, with up to `max_workers` batches in flight (one
+        by default; see `add_members_in_batches()`). If the list is already in
+        sync, no changes are sent. Emails are compared
+        case-insensitively, as Mailman does.
+
+        See `add_members()` and `remove_members()` for the optional arguments.
+        """
+        from noire.models.membership import SyncResults
+
+        current = {email.lower(): email for email in self._fetch_member_emails()}
+        desired = {email.lower(): email for email in emails}
+
+        to_remove = [email for key, email in current.items() if key not in desired]
+        to_add = [email for key, email in desired.items() if key not in current]
+
+        remove_results = self.remove_members_in_batches(
+            to_remove,
+            batch_size,
+            max_workers,
+            send_unsubscribe_message=send_unsubscribe_message,
+            send_owner_notifications=send_owner_notifications,
+        )
+        add_results = self.add_members_in_batches(
+            to_add,
+            batch_size,
+            max_workers,
+            send_welcome_message=send_welcome_message,
+            send_owner_notifications=send_owner_notifications,
+        )
+        return SyncResults(add_results=add_results, remove_results=remove_results)
+
+    @_instrumented
+    @_invalidates_cache
     def bulk_set_moderation_flag(self, should_moderate: bool) -> bool:
         """
         Use this to set all members' "moderation bit".
@@ -251,14 +726,26 @@ class Noire:
             "allmodbit_btn": "Set",
             "adminpw": self._list_password,
         }
-        response = self._session.post(endpoint, payload)
+        response = self._post(endpoint, payload, retry=True)
         return response.status_code == 200
 
+    @_instrumented
     def get_member_subscription_settings(self, email: str) -> Optional[MemberSettings]:
         """
         Retrieves a member's subscription settings. If the provided email is not
         subscribed to this list, this method will return `None`.
         """
+        settings = self._cached(
+            ("member_settings", email),
+            lambda: self._fetch_member_subscription_settings(email),
+        )
+        return settings.model_copy() if settings is not None else None
+
+    def _fetch_member_subscription_settings(
+        self, email: str
+    ) -> Optional[MemberSettings]:
+        from noire.parsers.members_list import extract_member_settings
+
         endpoint = MEMBERS_LIST_URL_TEMPLATE.format(
             mailman_base_url=self._mailman_base_url, list_name=self._list_name
         )
@@ -267,7 +754,7 @@ class Noire:
             "findmember_btn": "Search...",
             "adminpw": self._list_password,
         }
-        response = self._session.post(endpoint, payload)
+        response = self._post(endpoint, payload, retry=True)
         if response.status_code != 200:
             raise RuntimeError(
                 f"Unexpected error when fetching member settings for {email}: {response.status_code}"
@@ -279,28 +766,109 @@ class Noire:
         # Member not found.
         return None
 
+    @_instrumented
+    def get_member_subscription_settings_many(
+        self,
+        emails: List[str],
+        max_search_length: int = 4096,
+        max_workers: int = 8,
+    ) -> Dict[str, Optional[MemberSettings]]:
+        """
+        Retrieves the subscription settings of many members. Returns a dict
+        that maps each email to its settings, or to `None` if the email is not
+        subscribed to this list.
+
+        Mailman's member search accepts a regular expression, so this method
+        looks up many emails with each search (each search's expression is at
+        most `max_search_length` characters long). Searches with more results
+        than fit on one page are fetched page by page, up to `max_workers`
+        pages at once. Like `bulk_fetch_member_subscription_settings(
+        paginated=True)`, this does not modify the list's configuration.
+        """
+        all_settings = self._cached(
+            ("member_settings_many", tuple(emails), max_search_length),
+            lambda: self._fetch_member_subscription_settings_many(
+                emails, max_search_length, max_workers
+            ),
+        )
+        return {
+            email: settings.model_copy() if settings is not None else None
+            for email, settings in all_settings.items()
+        }
+
+    def _fetch_member_subscription_settings_many(
+        self, emails: List[str], max_search_length: int, max_workers: int
+    ) -> Dict[str, Optional[MemberSettings]]:
+        wanted = set(emails)
+        found: Dict[str, MemberSettings] = {}
+        for pattern in _member_search_patterns(sorted(wanted), max_search_length):
+            for page in self._iter_members_pages(max_workers, findmember=pattern):
+                # Mailman also matches members' names, so a search may return
+                # members that were not asked for.
+                for setting in page.members:
+                    if setting.email in wanted:
+                        found.setdefault(setting.email, setting)
+        return {email: found.get(email) for email in emails}
+
+    @_instrumented
     def bulk_fetch_member_subscription_settings(
-        self, emails: Optional[List[str]] = None
+        self,
+        emails: Optional[List[str]] = None,
+        paginated: bool = False,
+        max_workers: int = 8,
     ) -> List[MemberSettings]:
         """
         Retrieves member subscription settings in bulk. If `emails` is None,
         this will return all members' settings.
 
-        This method will modify the "admin_member_chunksize" configuration (the
-        number of members to show on a page). It will reset this value to its
-        previous value after completing.
+        By default, this method will modify the "admin_member_chunksize"
+        configuration (the number of members to show on a page) so that all
+        members appear on one page. It will reset this value to its previous
+        value after completing.
+
+        If `paginated` is set, the list configuration is left untouched.
+        Instead, this method walks Mailman's paginated membership view,
+        fetching up to `max_workers` pages concurrently.
         """
+        if paginated:
+            all_settings = self._cached(
+                "all_member_settings",
+                lambda: self._fetch_member_settings_by_page(max_workers),
+            )
+        else:
+            all_settings = self._cached(
+                "all_member_settings", self._fetch_member_settings_on_one_page
+            )
+
+        # Keep the relevant entries only (as copies, so that changes made by the
+        # caller do not leak into the cache).
+        if emails is None:
+            return [setting.model_copy() for setting in all_settings]
+        else:
+            wanted = set(emails)
+            return [
+                setting.model_copy()
+                for setting in all_settings
+                if setting.email in wanted
+            ]
+
+    def _fetch_member_settings_on_one_page(self) -> List[MemberSettings]:
+        from noire.parsers.members_list import extract_member_settings
+
         # 1. Count the number of members subscribed.
-        all_members = self.get_member_emails()
+        all_members = self._fetch_member_emails()
 
-        # 2. Set the chunk size appropriately so all member settings appear together.
-        current_chunk_size = self._set_chunk_size(len(all_members) + 1)
+        # 2. Set the chunk size appropriately so all member settings appear
+        #    together (unless they already do).
+        previous_chunk_size = self._fetch_general_options().admin_member_chunksize
+        chunk_size = max(previous_chunk_size, len(all_members) + 1)
+        self._set_chunk_size(chunk_size, previous_chunk_size)
 
         # 3. Bulk fetch all member settings.
         endpoint = MEMBERS_LIST_URL_TEMPLATE.format(
             mailman_base_url=self._mailman_base_url, list_name=self._list_name
         )
-        response = self._session.get(endpoint)
+        response = self._get(endpoint)
         if response.status_code != 200:
             raise RuntimeError(
                 f"Unexpected error when fetching member settings: {response.status_code}"
@@ -308,14 +876,122 @@ class Noire:
         all_settings = extract_member_settings(response.content.decode())
 
         # 4. Reset the chunk size.
-        self._set_chunk_size(current_chunk_size)
+        self._set_chunk_size(previous_chunk_size, chunk_size)
+        return all_settings
 
-        # 5. Keep the relevant entries only.
-        if emails is None:
-            return all_settings
+    def _fetch_member_settings_by_page(self, max_workers: int) -> List[MemberSettings]:
+        # A member may appear twice if the list changed while we were fetching it.
+        all_settings = []
+        seen = set()
+        for setting in self.iter_member_settings(max_workers):
+            if setting.email in seen:
+                continue
+            seen.add(setting.email)
+            all_settings.append(setting)
+        return all_settings
+
+    @_instrumented
+    def iter_member_settings(self, max_workers: int = 8) -> Iterator[MemberSettings]:
+        """
+        Yields every member's subscription settings, in Mailman's order, as
+        the membership pages are fetched and parsed. Up to `max_workers` pages
+        are fetched concurrently, and at most `2 * max_workers` pages (each
+        holding "admin_member_chunksize" members) are held in memory at once: a
+        batch of letters' first pages, plus a batch of the current letter's
+        other chunks. Memory use therefore does not grow with the size of the
+        list.
+
+        Like `bulk_fetch_member_subscription_settings(paginated=True)`, this
+        does not modify the list's configuration. Unlike it, this method does
+        not remove duplicates (which can occur if the membership list changes
+        during the iteration).
+        """
+        for page in self._iter_members_pages(max_workers):
+            yield from page.members
+
+    @_instrumented
+    def get_member_settings_table(self, max_workers: int = 8) -> MemberSettingsTable:
+        """
+        Retrieves every member's subscription settings as a compact
+        `MemberSettingsTable`, which uses far less memory than a list of
+        `MemberSettings` on large lists.
+
+        Like `iter_member_settings()`, this walks the paginated membership view
+        (fetching up to `max_workers` pages concurrently) and does not modify
+        the list's configuration.
+        """
+        from noire.models.membership import MemberSettingsTable
+
+        table = MemberSettingsTable()
+        for page in self._iter_members_pages(max_workers):
+            table.extend(page.members)
+        return table
+
+    def _iter_members_pages(
+        self, max_workers: int, findmember: Optional[str] = None
+    ) -> Iterator[MembersPage]:
+        # 1. The unqualified members page shows the first chunk of the first
+        #    letter, along with links to the other letters. If `findmember` is
+        #    set, only the members that match it are shown.
+        first_page = self._fetch_members_page({}, findmember)
+        if first_page.current_letter is None:
+            # All members fit on one page.
+            yield first_page
+            return
+
+        # 2. Walk the letters in order. Each letter's first chunk lists the
+        #    letter's other chunks.
+        def fetch_letter(letter: str) -> MembersPage:
+            if letter == first_page.current_letter:
+                return first_page
+            return self._fetch_members_page({"letter": letter}, findmember)
+
+        def fetch_chunk(key: Tuple[str, int]) -> MembersPage:
+            letter, chunk = key
+            return self._fetch_members_page(
+                {"letter": letter, "chunk": chunk}, findmember
+            )
+
+        # While a letter's other chunks are fetched, the rest of its batch of
+        # letter pages is still held, so up to `2 * max_workers` pages are held
+        # at once.
+        letter_pages = iter_concurrently(fetch_letter, first_page.letters, max_workers)
+        for letter, letter_page in zip(first_page.letters, letter_pages):
+            yield letter_page
+            remaining_chunks = [
+                (letter, chunk) for chunk in sorted(letter_page.chunks) if chunk != 0
+            ]
+            yield from iter_concurrently(fetch_chunk, remaining_chunks, max_workers)
+
+    def _fetch_members_page(
+        self, params: Dict[str, Union[str, int]], findmember: Optional[str] = None
+    ) -> MembersPage:
+        from noire.parsers.members_list import extract_members_page
+
+        endpoint = MEMBERS_LIST_URL_TEMPLATE.format(
+            mailman_base_url=self._mailman_base_url, list_name=self._list_name
+        )
+        if findmember is None:
+            response = self._get(endpoint, params=params)
         else:
-            return [setting for setting in all_settings if setting.email in emails]
+            # Search expressions can be long, so they are sent in the body. The
+            # letter and chunk stay in the query string, like in Mailman's links.
+            payload = {
+                "findmember": findmember,
+                "findmember_btn": "Search...",
+                "adminpw": self._list_password,
+            }
+            response = self._send(
+                "POST", endpoint, retry=True, params=params, data=payload
+            )
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"Unexpected error when fetching member settings: {response.status_code}"
+            )
+        return extract_members_page(response.content.decode())
 
+    @_instrumented
+    @_invalidates_cache
     def set_member_subscription_settings(self, settings: List[MemberSettings]) -> bool:
         """
         Updates members' subscription settings to the provided settings. Note
@@ -336,9 +1012,90 @@ class Noire:
         for setting in settings:
             for k, v in setting.to_html_values().items():
                 payload.append((k, v))
-        response = self._session.post(endpoint, payload)
+        response = self._post(endpoint, payload, retry=True)
         return response.status_code == 200
 
+    @_instrumented
+    def update_member_subscription_settings(
+        self,
+        settings: List[MemberSettings],
+        current_settings: Optional[List[MemberSettings]] = None,
+        batch_size: int = 200,
+        max_workers: int = 1,
+    ) -> List[MemberSettings]:
+        """
+        Updates members' subscription settings to the provided settings, but
+        only submits the members whose settings differ from their current
+        settings. Returns the settings that were submitted.
+
+        If `current_settings` is None, the current settings are fetched from
+        Mailman (without modifying the list's configuration, and bypassing the
+        read cache so that changes made by others are not missed). You can pass
+        settings that you fetched earlier instead to skip this step. Members
+        that are missing from `current_settings` are always submitted.
+
+        The changes are submitted in batches of at most `batch_size` members,
+        with up to `max_workers` batches in flight (one by default; see
+        `add_members_in_batches()`). If any batch fails, this
+        method raises a `RuntimeError` after the other batches finish.
+        """
+        if current_settings is None:
+            current_settings = self._fetch_member_settings_by_page(
+                _CURRENT_SETTINGS_MAX_WORKERS
+            )
+        current_by_email = {setting.email: setting for setting in current_settings}
+        changed = [
+            setting
+            for setting in settings
+            if current_by_email.get(setting.email) != setting
+        ]
+
+        def submit_batch(batch: List[MemberSettings]) -> None:
+            if not self.set_member_subscription_settings(batch):
+                raise RuntimeError("Failed to set member subscription settings.")
+
+        _, failed, error = _run_batches(submit_batch, changed, batch_size, max_workers)
+        if error is not None:
+            raise RuntimeError(
+                f"Failed to update the subscription settings of {len(failed)} member(s)."
+            ) from error
+        return changed
+
+    @_instrumented
+    def change_member_subscription_settings(
+        self,
+        emails: List[str],
+        changes: MemberSettingsChanges,
+        current_settings: Optional[List[MemberSettings]] = None,
+        batch_size: int = 200,
+        max_workers: int = 1,
+    ) -> List[MemberSettings]:
+        """
+        Applies `changes` to the subscription settings of the given members
+        (e.g., sets `moderated=True` for all of them) and leaves their other
+        settings as they are. Emails that are not subscribed to the list are
+        ignored. Returns the settings that were submitted.
+
+        See `update_member_subscription_settings()` for the other arguments.
+        """
+        if current_settings is None:
+            current_settings = self._fetch_member_settings_by_page(
+                _CURRENT_SETTINGS_MAX_WORKERS
+            )
+        wanted = set(emails)
+        targets = [
+            setting.with_changes(changes)
+            for setting in current_settings
+            if setting.email in wanted
+        ]
+        return self.update_member_subscription_settings(
+            targets,
+            current_settings=current_settings,
+            batch_size=batch_size,
+            max_workers=max_workers,
+        )
+
+    @_instrumented
     def set_accept_these_nonmembers(self, emails: List[str]) -> bool:
         """
         Sets the "accept_these_nonmembers" setting with the provided emails. The
@@ -356,9 +1113,10 @@ class Noire:
             "adminpw": self._list_password,
             "accept_these_nonmembers": "\n".join(emails),
         }
-        response = self._session.post(endpoint, payload)
+        response = self._post(endpoint, payload, retry=True)
         return response.status_code == 200
 
+    @_instrumented
     def set_default_member_moderation(self, should_moderate: bool) -> bool:
         """
         Sets the "default_member_moderation" flag. If set to true, new members
@@ -372,25 +1130,54 @@ class Noire:
             "default_member_moderation": 1 if should_moderate else 0,
             "submit": "Submit Your Changes",
         }
-        response = self._session.post(endpoint, payload)
+        response = self._post(endpoint, payload, retry=True)
         return response.status_code == 200
 
+    @_instrumented
     def get_general_options(self) -> GeneralOptions:
         """
         Fetches the current general options settings.
         """
+        return self._cached("general_options", self._fetch_general_options).model_copy()
+
+    def _fetch_general_options(self) -> GeneralOptions:
+        from noire.parsers.settings import extract_general_options
+
         endpoint = GENERAL_SETTINGS_URL_TEMPLATE.format(
             mailman_base_url=self._mailman_base_url, list_name=self._list_name
         )
-        response = self._session.get(endpoint)
+        response = self._get(endpoint)
         if response.status_code != 200:
             raise RuntimeError("Failed to fetch the general options.")
         return extract_general_options(response.content.decode())
 
-    def set_general_options(self, changes: GeneralOptionsChanges) -> bool:
+    @_instrumented
+    def set_general_options(
+        self,
+        changes: GeneralOptionsChanges,
+        current_options: Optional[GeneralOptions] = None,
+    ) -> bool:
         """
-        Modifies the general options.
+        Modifies the general options. Only the options that differ from their
+        current values are submitted; if none do, nothing is submitted.
+
+        If `current_options` is None, the current options are fetched from
+        Mailman (bypassing the cache, so that a stale value cannot cause a
+        change to be skipped). You can pass options that you fetched earlier
+        instead to skip this step.
         """
+        if current_options is None:
+            current_options = self._fetch_general_options()
+        changed = changes.without_current_values(current_options)
+        if changed.is_empty():
+            return True
+        return self._submit_general_options(changed)
+
+    @_invalidates_cache
+    def _submit_general_options(self, changes: GeneralOptionsChanges) -> bool:
+        return self._post_general_options(changes)
+
+    def _post_general_options(self, changes: GeneralOptionsChanges) -> bool:
         payload = {
             "submit": "Submit Your Changes",
             "adminpw": self._list_password,
@@ -414,18 +1201,181 @@ class Noire:
         endpoint = GENERAL_SETTINGS_URL_TEMPLATE.format(
             mailman_base_url=self._mailman_base_url, list_name=self._list_name
         )
-        response = self._session.post(endpoint, payload)
+        response = self._post(endpoint, payload, retry=True)
         return response.status_code == 200
 
-    def _set_chunk_size(self, chunk_size: int) -> int:
+    def _get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self._send("GET", url, retry=True, **kwargs)
+
+    def _post(self, url: str, data: Any, retry: bool = False) -> requests.Response:
         """
-        Sets the chunk size to the given value and returns the previously used
-        chunk size.
+        Sends a POST request. Set `retry` only if repeating the request has no
+        further effect (e.g., setting an option to a value).
+        """
+        return self._send("POST", url, retry=retry, data=data)
+
+    def _send(
+        self, method: str, url: str, retry: bool, **kwargs: Any
+    ) -> requests.Response:
+        scope = current_scope()
+        if scope is None:
+            return self._transport.request(
+                self._session, method, url, retry=retry, **kwargs
+            )
+        start = time.perf_counter()
+        response = self._transport.request(
+            self._session, method, url, retry=retry, **kwargs
+        )
+        scope.observer.on_request(
+            scope.call,
+            method,
+            url,
+            response.status_code,
+            len(response.content),
+            time.perf_counter() - start,
+        )
+        return response
+
+    def _cached(self, key: Hashable, fetch: Callable[[], T]) -> T:
         """
-        options = self.get_general_options()
-        succeeded = self.set_general_options(
-            GeneralOptionsChanges(admin_member_chunksize=chunk_size)
+        Returns the cached result of `fetch`. The value is shared with later
+        calls, so callers must return a copy of any mutable value.
+        """
+        if self._cache is None:
+            return fetch()
+        return self._cache.get_or_fetch(self._cache_key(key), fetch)
+
+    def _cache_key(self, key: Hashable) -> Hashable:
+        # A cache may be shared by clients for different lists.
+        return (self._mailman_base_url, self._list_name, key)
+
+    @_invalidates_cache
+    def _post_add_members(
+        self,
+        emails: List[str],
+        send_welcome_message: bool,
+        send_owner_notifications: bool,
+    ) -> requests.Response:
+        endpoint = ADD_MEMBERS_URL_TEMPLATE.format(
+            mailman_base_url=self._mailman_base_url, list_name=self._list_name
+        )
+        payload = {
+            "adminpw": self._list_password,
+            "subscribees": "\n".join(emails),
+            "subscribe_or_invite": 0,  # 0 indicates subscribe.
+            "send_welcome_msg_to_this_batch": 1 if send_welcome_message else 0,
+            "send_notifications_to_list_owner": 1 if send_owner_notifications else 0,
+        }
+        return self._post(endpoint, payload)
+
+    @_invalidates_cache
+    def _post_remove_members(
+        self,
+        emails: List[str],
+        send_unsubscribe_message: bool,
+        send_owner_notifications: bool,
+    ) -> requests.Response:
+        endpoint = REMOVE_MEMBERS_URL_TEMPLATE.format(
+            mailman_base_url=self._mailman_base_url, list_name=self._list_name
         )
+        payload = {
+            "adminpw": self._list_password,
+            "unsubscribees": "\n".join(emails),
+            "send_unsub_ack_to_this_batch": 1 if send_unsubscribe_message else 0,
+            "send_unsub_notifications_to_list_owner": (
+                1 if send_owner_notifications else 0
+            ),
+        }
+        return self._post(endpoint, payload)
+
+    def _set_chunk_size(self, chunk_size: int, current_chunk_size: int) -> None:
+        """
+        Sets the chunk size to the given value, unless it is already set to
+        it.
+        """
+        from noire.models.settings import GeneralOptionsChanges
+
+        if chunk_size == current_chunk_size:
+            return
+        # The chunk size does not affect any other cached results.
+        try:
+            succeeded = self._post_general_options(
+                GeneralOptionsChanges(admin_member_chunksize=chunk_size)
+            )
+        finally:
+            if self._cache is not None:
+                self._cache.invalidate(self._cache_key("general_options"))
         if not succeeded:
             raise RuntimeError("Failed to set chunk size.")
-        return options.admin_member_chunksize
+
+
+def _member_search_patterns(emails: List[str], max_length: int) -> Iterator[str]:
+    """
+    Packs `emails` into as few regular expressions for Mailman's member search
+    as possible. Each expression matches whole addresses and is at most
+    `max_length` characters long (unless a single email is longer).
+    """
+    batch: List[str] = []
+    length = len("^(?:)$")
+    for email in emails:
+        escaped = re.escape(email)
+        if len(batch) > 0 and length + len(escaped) + 1 > max_length:
+            yield "^(?:" + "|".join(batch) + ")$"
+            batch = []
+            length = len("^(?:)$")
+        batch.append(escaped)
+        length += len(escaped) + (1 if len(batch) > 1 else 0)
+    if len(batch) > 0:
+        yield "^(?:" + "|".join(batch) + ")$"
+
+
+def _moderation_decision_values(
+    message_id: int, decision: ModerationDecision
+) -> Dict[Union[str, int], Union[str, int]]:
+    from noire.models.moderation import ModerationAction
+
+    values: Dict[Union[str, int], Union[str, int]] = {
+        message_id: decision.action.value,
+    }
+    if (
+        decision.action == ModerationAction.Reject
+        and decision.rejection_message is not None
+    ):
+        values[f"comment-{message_id}"] = decision.rejection_message
+    if decision.preserve_message_for_admin:
+        values[f"preserve-{message_id}"] = "on"
+    if decision.forward_message_to_list_owner:
+        values[f"forward-{message_id}"] = "on"
+    return values
+
+
+def _run_batches(
+    fn: Callable[[List[T]], R], items: List[T], batch_size: int, max_workers: int
+) -> Tuple[List[R], List[T], Optional[Exception]]:
+    """
+    Runs `fn` on batches of `items`. Returns the results of the batches that
+    succeeded, the items in the batches that failed, and the first error.
+    """
+    if batch_size < 1:
+        raise ValueError("The batch size must be at least 1.")
+    batches = [items[i : i + batch_size] for i in range(0, len(items), batch_size)]
+
+    def run_batch(batch: List[T]) -> Tuple[Optional[R], Optional[Exception]]:
+        try:
+            return fn(batch), None
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            return None, ex
+
+    results: List[R] = []
+    remaining: List[T] = []
+    first_error: Optional[Exception] = None
+    for batch, (result, error) in zip(
+        batches, map_concurrently(run_batch, batches, max_workers)
+    ):
+        if error is not None:
+            remaining.extend(batch)
+            if first_error is None:
+                first_error = error
+        elif result is not None:
+            results.append(result)
+    return results, remaining, first_error
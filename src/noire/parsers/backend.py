@@ -0,0 +1,62 @@
+import enum
+import importlib.util
+import time
+from bs4 import BeautifulSoup
+
+from noire.instrumentation import is_timing_parsers, record_tree_seconds
+
+
+class ParserBackend(enum.Enum):
+    # NOTE: The values are significant; they are the tree builder names used by
+    # BeautifulSoup.
+
+    # Python's built-in HTML parser. Always available.
+    HtmlParser = "html.parser"
+    # The lxml parser (a C extension). Much faster on large pages, but requires
+    # `lxml` to be installed (e.g., `pip install noire[lxml]`).
+    Lxml = "lxml"
+
+
+_DEFAULT_BACKEND = ParserBackend.HtmlParser
+_current_backend = _DEFAULT_BACKEND
+
+
+def is_parser_backend_available(backend: ParserBackend) -> bool:
+    if backend == ParserBackend.HtmlParser:
+        return True
+    return importlib.util.find_spec(backend.value) is not None
+
+
+def get_parser_backend() -> ParserBackend:
+    return _current_backend
+
+
+def set_parser_backend(backend: ParserBackend) -> None:
+    """
+    Selects the HTML parser used by all of Noire's page extractors.
+    """
+    global _current_backend  # pylint: disable=global-statement
+    if not is_parser_backend_available(backend):
+        raise RuntimeError(f"The {backend.value} parser backend is not installed.")
+    _current_backend = backend
+
+
+def use_fastest_parser_backend() -> ParserBackend:
+    """
+    Selects the fastest installed parser backend, falling back to Python's
+    built-in parser. Returns the selected backend.
+    """
+    for backend in (ParserBackend.Lxml, ParserBackend.HtmlParser):
+        if is_parser_backend_available(backend):
+            set_parser_backend(backend)
+            break
+    return _current_backend
+
+
+def make_soup(raw_html: str) -> BeautifulSoup:
+    if not is_timing_parsers():
+        return BeautifulSoup(raw_html, _current_backend.value)
+    start = time.perf_counter()
+    soup = BeautifulSoup(raw_html, _current_backend.value)
+    record_tree_seconds(time.perf_counter() - start)
+    return soup
@@ -0,0 +1,64 @@
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup, Tag
+
+from noire.parsers.backend import make_soup
+
+
+class FormControls:
+    """
+    The named elements (e.g., inputs and text areas) on one of Mailman's admin
+    pages, indexed by name in a single pass over the page.
+
+    Looking up every option with its own `soup.find()` walks the whole page
+    once per option; build this index once instead.
+    """
+
+    def __init__(self, soup: BeautifulSoup) -> None:
+        self._controls: Dict[str, List[Tag]] = {}
+        for tag in soup.find_all(attrs={"name": True}):
+            self._controls.setdefault(str(tag["name"]), []).append(tag)
+
+    @classmethod
+    def from_html(cls, raw_html: str) -> "FormControls":
+        return cls(make_soup(raw_html))
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._controls
+
+    def first(self, name: str) -> Optional[Tag]:
+        """
+        Returns the first element named `name` on the page, or `None`.
+        """
+        tags = self._controls.get(name)
+        return tags[0] if tags is not None else None
+
+    def all(self, name: str) -> List[Tag]:
+        """
+        Returns all the elements named `name`, in page order.
+        """
+        return list(self._controls.get(name, []))
+
+    def value(self, name: str) -> Optional[str]:
+        """
+        Returns the value of the first element named `name`: an input's value
+        or a text area's text. Returns `None` if there is no such element.
+        """
+        tag = self.first(name)
+        if tag is None:
+            return None
+        if tag.name == "input":
+            return str(tag.get("value", ""))
+        if tag.name == "textarea":
+            return tag.text
+        raise NotImplementedError(f"Unsupported tag type {tag.name} for field {name}")
+
+    def checked_value(self, name: str) -> Optional[str]:
+        """
+        Returns the value of the checked input (e.g., radio button) named
+        `name`, or `None` if none of them is checked.
+        """
+        for tag in self._controls.get(name, []):
+            if tag.name == "input" and "checked" in tag.attrs:
+                return str(tag.get("value", ""))
+        return None
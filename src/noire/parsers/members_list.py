@@ -1,15 +1,21 @@
+import re
 from bs4 import BeautifulSoup
-from typing import List
-from urllib.parse import unquote
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
 
+from noire.instrumentation import timed_parser
+from noire.parsers.backend import make_soup
 from noire.models.membership import (
     BulkAddResults,
     MemberError,
     BulkRemoveResults,
     MemberSettings,
+    MemberSettingsTable,
+    MembersPage,
 )
 
 
+@timed_parser
 def extract_member_emails(raw_html: str) -> List[str]:
     """
     Extracts the member emails that appear on `/mailman/admin/<list name>/members`
@@ -19,7 +25,7 @@ def extract_member_emails(raw_html: str) -> List[str]:
     table_index = 4
     member_emails: List[str] = []
 
-    soup = BeautifulSoup(raw_html, "html.parser")
+    soup = make_soup(raw_html)
 
     # Find all the tables on the page
     tables = soup.find_all("table")
@@ -41,10 +47,33 @@ def extract_member_emails(raw_html: str) -> List[str]:
     return member_emails
 
 
-def extract_add_results(
-    raw_html: str,
-) -> BulkAddResults:
-    soup = BeautifulSoup(raw_html, "html.parser")
+@timed_parser
+def extract_add_results(raw_html: str) -> BulkAddResults:
+    """
+    Extracts the results of adding members from the page Mailman returns.
+
+    Only the "Successfully subscribed" and "Error subscribing" sections are
+    scanned; no tree is built. Pages that the scanner cannot read exactly like
+    `extract_add_results_soup()` would are handed to it instead.
+    """
+    added = _scan_section(raw_html, "Successfully subscribed:")
+    failed = _scan_section(raw_html, "Error subscribing:")
+    if added is None or failed is None:
+        return _extract_add_results_soup(raw_html)
+    return BulkAddResults(added=added, errors=_member_errors(failed))
+
+
+@timed_parser
+def extract_add_results_soup(raw_html: str) -> BulkAddResults:
+    """
+    Like `extract_add_results()`, but always parses the whole page into a
+    tree. This is the reference implementation for `extract_add_results()`.
+    """
+    return _extract_add_results_soup(raw_html)
+
+
+def _extract_add_results_soup(raw_html: str) -> BulkAddResults:
+    soup = make_soup(raw_html)
 
     # Extract emails under "Successfully subscribed"
     success_subscribing = soup.find("h5", string="Successfully subscribed:")
@@ -57,24 +86,50 @@ def extract_add_results(
 
     # Extract emails under "Error subscribing"
     error_subscribing = soup.find("h5", string="Error subscribing:")
-    error_emails = []
-
     if error_subscribing is not None:
         cleaned_errors = _extract_from_malformed_li(
             error_subscribing.find_next("ul").decode_contents()  # type: ignore
         )
-        for item in cleaned_errors:
-            parts = item.split(" -- ")
-            if len(parts) > 1:
-                error_emails.append(MemberError(email=parts[0], error_reason=parts[1]))
-            else:
-                error_emails.append(MemberError(email=parts[0], error_reason=None))
+    else:
+        cleaned_errors = []
+
+    return BulkAddResults(added=success_emails, errors=_member_errors(cleaned_errors))
 
-    return BulkAddResults(added=success_emails, errors=error_emails)
+
+def _member_errors(items: List[str]) -> List[MemberError]:
+    error_emails = []
+    for item in items:
+        parts = item.split(" -- ")
+        if len(parts) > 1:
+            error_emails.append(MemberError(email=parts[0], error_reason=parts[1]))
+        else:
+            error_emails.append(MemberError(email=parts[0], error_reason=None))
+    return error_emails
 
 
+@timed_parser
 def extract_remove_results(raw_html: str) -> BulkRemoveResults:
-    soup = BeautifulSoup(raw_html, "html.parser")
+    """
+    Extracts the results of removing members from the page Mailman returns,
+    by scanning only the "Successfully Unsubscribed" section (see
+    `extract_add_results()`).
+    """
+    removed = _scan_section(raw_html, "Successfully Unsubscribed:")
+    if removed is None:
+        return _extract_remove_results_soup(raw_html)
+    return BulkRemoveResults(removed=removed)
+
+
+@timed_parser
+def extract_remove_results_soup(raw_html: str) -> BulkRemoveResults:
+    """
+    The reference implementation for `extract_remove_results()`.
+    """
+    return _extract_remove_results_soup(raw_html)
+
+
+def _extract_remove_results_soup(raw_html: str) -> BulkRemoveResults:
+    soup = make_soup(raw_html)
 
     # Extract emails under "Successfully unsubscribed"
     success_removed = soup.find("h5", string="Successfully Unsubscribed:")
@@ -88,17 +143,85 @@ def extract_remove_results(raw_html: str) -> BulkRemoveResults:
     return BulkRemoveResults(removed=removed)
 
 
+@timed_parser
 def extract_member_settings(raw_html: str) -> List[MemberSettings]:
-    soup = BeautifulSoup(raw_html, "html.parser")
+    soup = make_soup(raw_html)
+    return _extract_member_settings(soup)
+
+
+@timed_parser
+def extract_member_settings_table(raw_html: str) -> MemberSettingsTable:
+    """
+    Like `extract_member_settings()`, but fills a compact `MemberSettingsTable`
+    without creating a `MemberSettings` object per member.
+    """
+    soup = make_soup(raw_html)
+    return _extract_member_settings_table(soup)
+
+
+@timed_parser
+def extract_members_page(raw_html: str) -> MembersPage:
+    """
+    Extracts the member settings and the pagination links that appear on one
+    page of `/mailman/admin/<list name>/members`.
+    """
+    soup = make_soup(raw_html)
+    member_settings = _extract_member_settings_table(soup)
+
+    letters: List[str] = []
+    current_letter = None
+    chunks: List[int] = []
+    for link in soup.find_all("a", href=True):
+        url = urlsplit(link["href"])
+        if not url.path.endswith("/members"):
+            continue
+        query = parse_qs(url.query)
+        if "letter" not in query:
+            continue
+        letter = query["letter"][0]
+        if "chunk" in query:
+            chunks.append(int(query["chunk"][0]))
+        else:
+            letters.append(letter)
+            # Mailman shows the current letter as "[X]".
+            if link.text.strip().startswith("["):
+                current_letter = letter
+
+    if len(letters) > 0 and current_letter is None:
+        raise RuntimeError("Unexpected member settings page format.")
+
+    return MembersPage(
+        members=member_settings,
+        letters=letters,
+        current_letter=current_letter,
+        chunks=chunks,
+    )
+
+
+def _extract_member_settings(soup: BeautifulSoup) -> List[MemberSettings]:
+    return [
+        MemberSettings.from_html_values(email, setting_enabled)
+        for email, setting_enabled in _iter_member_rows(soup)
+    ]
+
+
+def _extract_member_settings_table(soup: BeautifulSoup) -> MemberSettingsTable:
+    table = MemberSettingsTable()
+    for email, setting_enabled in _iter_member_rows(soup):
+        table.append_html_values(email, setting_enabled)
+    return table
+
+
+def _iter_member_rows(soup: BeautifulSoup) -> Iterator[Tuple[str, Dict[str, bool]]]:
     member_table = soup.find("table", {"width": "90%", "border": "2"})
     rows = member_table.find_all("tr")  # type: ignore
-    if len(rows) < 3:
-        # No members found.
-        return []
 
-    member_settings: List[MemberSettings] = []
-    for row in rows[2:]:
+    for row in rows:
         checkboxes = row.find_all("input", type="CHECKBOX")
+        if len(checkboxes) == 0:
+            # Header rows (the member count, the letter links when the list is
+            # paginated, and the column titles) have no checkboxes.
+            continue
 
         setting_enabled = {}
         emails = []
@@ -112,19 +235,60 @@ def extract_member_settings(raw_html: str) -> List[MemberSettings]:
             setting_enabled[setting_name] = checkbox["value"] == "on"
 
         # Sanity check.
-        if len(emails) == 0 or not all(email == emails[0] for email in emails):
+        if not all(email == emails[0] for email in emails):
             raise RuntimeError("Unexpected member settings page format.")
 
-        member_settings.append(
-            MemberSettings.from_html_values(emails[0], setting_enabled)
-        )
+        yield emails[0], setting_enabled
 
-    return member_settings
+
+# The roster lists members in <ul> elements, one "user at domain" link per
+# member. The scanner below finds these links without building a tree.
+_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+_RAW_TEXT_ELEMENT = re.compile(
+    r"<(?:script|style|textarea|xmp|plaintext|iframe|noembed|noframes)\b",
+    re.IGNORECASE,
+)
+# Attribute values may contain ">".
+_ATTRIBUTES = r"""(?:\s(?:[^>"']|"[^"]*"|'[^']*')*)?"""
+_UL_OPEN = re.compile(r"<ul\b", re.IGNORECASE)
+_UL = re.compile(rf"<ul{_ATTRIBUTES}>(.*?)</ul\s*>", re.IGNORECASE | re.DOTALL)
+_A_OPEN = re.compile(r"<a\b", re.IGNORECASE)
+_LI_TAG = re.compile(r"</?li>")
+# A heading that holds anything other than plain text.
+_UNUSUAL_H5 = re.compile(r"<h5\b[^>]*>(?![^<&]*</h5\s*>)", re.IGNORECASE)
+_A = re.compile(rf"<a{_ATTRIBUTES}>(.*?)</a\s*>", re.IGNORECASE | re.DOTALL)
 
 
+@timed_parser
 def extract_emails_from_roster(raw_html: str) -> List[str]:
+    """
+    Extracts the member emails that appear on `/mailman/roster/<list name>`.
+
+    This scans the page for the member links directly. Pages that the scanner
+    cannot read exactly like `extract_emails_from_roster_soup()` would (e.g.,
+    links with markup or character references inside them) are handed to
+    `extract_emails_from_roster_soup()` instead, so both always return the
+    same emails.
+    """
+    emails = _scan_roster(raw_html)
+    if emails is None:
+        return _extract_emails_from_roster_soup(raw_html)
+    return emails
+
+
+@timed_parser
+def extract_emails_from_roster_soup(raw_html: str) -> List[str]:
+    """
+    Extracts the member emails that appear on `/mailman/roster/<list name>`
+    from a parsed tree of the page. This is the reference implementation for
+    `extract_emails_from_roster()`.
+    """
+    return _extract_emails_from_roster_soup(raw_html)
+
+
+def _extract_emails_from_roster_soup(raw_html: str) -> List[str]:
     parsed_emails = []
-    soup = BeautifulSoup(raw_html, "html.parser")
+    soup = make_soup(raw_html)
     member_lists = soup.find_all("ul")
     for member_list in member_lists:
         email_wraps = member_list.find_all("a")
@@ -137,6 +301,90 @@ def extract_emails_from_roster(raw_html: str) -> List[str]:
     return parsed_emails
 
 
+def _scan_roster(raw_html: str) -> Optional[List[str]]:
+    """
+    Returns `None` if the page has anything that the tree builder might
+    interpret differently from this scanner.
+    """
+    # 1. Comments may hide markup; elements such as <script> hold raw text.
+    page = _COMMENT.sub("", raw_html)
+    if "<!--" in page or _RAW_TEXT_ELEMENT.search(page) is not None:
+        return None
+
+    # 2. Every list must be closed and must not contain another list.
+    member_lists = _UL.findall(page)
+    if len(member_lists) != len(_UL_OPEN.findall(page)):
+        return None
+
+    emails = []
+    for member_list in member_lists:
+        if _UL_OPEN.search(member_list) is not None:
+            return None
+        links = _A.findall(member_list)
+        if len(links) != len(_A_OPEN.findall(member_list)):
+            return None
+        for contents in links:
+            # The tree builder would re-serialize markup and character
+            # references, and links without "user at domain" text may raise.
+            if "<" in contents or ">" in contents or "&" in contents:
+                return None
+            email_parts = contents.split(" ")
+            if len(email_parts) < 2 or (
+                email_parts[1] == "at" and len(email_parts) < 3
+            ):
+                return None
+            if email_parts[1] != "at":
+                continue
+            emails.append(f"{email_parts[0]}@{email_parts[2]}")
+    return emails
+
+
+def _scan_section(raw_html: str, heading: str) -> Optional[List[str]]:
+    """
+    Returns the items of the list that follows the `heading` <h5>, or an
+    empty list if there is no such heading. Returns `None` if the page has
+    anything that the tree builder might interpret differently from this
+    scanner.
+    """
+    # 1. Comments and raw-text elements may hide markup, and headings with
+    #    markup or character references may match once they are parsed.
+    if (
+        "<!--" in raw_html
+        or _RAW_TEXT_ELEMENT.search(raw_html) is not None
+        or _UNUSUAL_H5.search(raw_html) is not None
+    ):
+        return None
+    heading_match = re.search(
+        rf"<h5{_ATTRIBUTES}>(?-i:{re.escape(heading)})</h5\s*>",
+        raw_html,
+        re.IGNORECASE,
+    )
+    if heading_match is None:
+        return []
+
+    # 2. Every list on the page must be closed and must not contain another
+    #    list, so that the heading cannot be inside an unclosed list.
+    lists = list(_UL.finditer(raw_html))
+    if len(lists) != len(_UL_OPEN.findall(raw_html)) or any(
+        _UL_OPEN.search(match.group(1)) is not None for match in lists
+    ):
+        return None
+
+    # 3. The heading must be followed by a list that only contains text and
+    #    <li> tags.
+    list_match = next(
+        (match for match in lists if match.start() >= heading_match.end()), None
+    )
+    if list_match is None:
+        return None
+    contents = list_match.group(1)
+    items = _LI_TAG.split(contents)
+    for item in items:
+        if "<" in item or ">" in item or "&" in item:
+            return None
+    return [item.strip() for item in items if len(item.strip()) > 0]
+
+
 def _extract_from_malformed_li(raw_content: str) -> List[str]:
     # Mailman's lists are malformed (they are missing </li> tags). This function
     # works around the malformed HTML and extracts the intended list items.
@@ -1,13 +1,15 @@
-from bs4 import BeautifulSoup
 from typing import List, Optional
 from datetime import datetime
 
+from noire.instrumentation import timed_parser
+from noire.parsers.backend import make_soup
 from noire.models.moderation import ModerationRequest, ModerationRequestDetails
 
 
+@timed_parser
 def extract_moderation_requests(raw_html: str) -> List[ModerationRequest]:
     results = []
-    soup = BeautifulSoup(raw_html, "html.parser")
+    soup = make_soup(raw_html)
     held_messages_by_sender = soup.find_all("table", border="1")
 
     for sender_group in held_messages_by_sender:
@@ -53,10 +55,11 @@ def extract_moderation_requests(raw_html: str) -> List[ModerationRequest]:
     return results
 
 
+@timed_parser
 def extract_moderation_post_details(
     message_id: int, raw_html: str
 ) -> Optional[ModerationRequestDetails]:
-    soup = BeautifulSoup(raw_html, "html.parser")
+    soup = make_soup(raw_html)
 
     excerpt_heading = soup.find("strong", string="Message Excerpt:")
     if excerpt_heading is None:
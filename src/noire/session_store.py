@@ -0,0 +1,137 @@
+import hashlib
+import hmac
+import json
+import os
+import pathlib
+import tempfile
+import time
+from typing import Optional, Union
+
+from requests.cookies import RequestsCookieJar, create_cookie
+
+# The parameters used to derive the password verifier that is stored with each
+# session.
+_VERIFIER_HASH = "sha256"
+_VERIFIER_ITERATIONS = 100_000
+_VERIFIER_SALT_BYTES = 16
+
+
+class SessionStore:
+    """
+    Persists Mailman's authentication cookies on disk so that new clients can
+    skip logging in. Sessions are keyed by the Mailman base URL and the list
+    name.
+
+    The store's directory is only accessible by the current user and each
+    session file is only readable and writable by the current user, since the
+    cookies grant admin access to the list.
+
+    Each session also stores a salted hash of the password it was created
+    with. A stored session is only handed to a caller that knows that
+    password, so a store entry alone does not grant access to the list.
+    """
+
+    def __init__(self, directory: Optional[Union[str, os.PathLike]] = None) -> None:
+        if directory is None:
+            cache_home = os.environ.get("XDG_CACHE_HOME", "~/.cache")
+            directory = pathlib.Path(cache_home).expanduser() / "noire" / "sessions"
+        self._directory = pathlib.Path(directory)
+
+    def load(
+        self,
+        mailman_base_url: str,
+        list_name: str,
+        list_password: str,
+        cookies: RequestsCookieJar,
+    ) -> bool:
+        """
+        Adds the stored cookies for the list to `cookies`. Returns false if
+        there is no stored session, if it was created with a different
+        password, or if all of its cookies have expired.
+        """
+        try:
+            with open(
+                self._path(mailman_base_url, list_name), "r", encoding="utf-8"
+            ) as file:
+                stored = json.load(file)
+            salt = bytes.fromhex(stored["salt"])
+            verifier = bytes.fromhex(stored["verifier"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        if not hmac.compare_digest(verifier, _derive_verifier(list_password, salt)):
+            return False
+
+        now = time.time()
+        loaded = False
+        for cookie in stored.get("cookies", []):
+            if cookie.get("expires") is not None and cookie["expires"] <= now:
+                continue
+            cookies.set_cookie(create_cookie(**cookie))
+            loaded = True
+        return loaded
+
+    def save(
+        self,
+        mailman_base_url: str,
+        list_name: str,
+        list_password: str,
+        cookies: RequestsCookieJar,
+    ) -> None:
+        """
+        Stores the cookies for the list, replacing any previously stored ones.
+        Only call this once `list_password` has been accepted by Mailman.
+        """
+        salt = os.urandom(_VERIFIER_SALT_BYTES)
+        stored = {
+            "salt": salt.hex(),
+            "verifier": _derive_verifier(list_password, salt).hex(),
+            "cookies": [
+                {
+                    "name": cookie.name,
+                    "value": cookie.value,
+                    "domain": cookie.domain,
+                    "path": cookie.path,
+                    "expires": cookie.expires,
+                    "secure": cookie.secure,
+                }
+                for cookie in cookies
+            ],
+        }
+        self._directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        path = self._path(mailman_base_url, list_name)
+        # Write to a temporary file first so that concurrent readers never see
+        # a partially-written session. Each writer (including threads of this
+        # process) gets its own temporary file; `mkstemp()` creates it with
+        # 0600 permissions.
+        fd, temp_path = tempfile.mkstemp(
+            dir=self._directory, prefix=f".{path.stem}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(stored, file)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def clear(self, mailman_base_url: str, list_name: str) -> None:
+        """
+        Removes the stored session for the list, if there is one.
+        """
+        try:
+            os.remove(self._path(mailman_base_url, list_name))
+        except FileNotFoundError:
+            pass
+
+    def _path(self, mailman_base_url: str, list_name: str) -> pathlib.Path:
+        key = f"{mailman_base_url}\0{list_name}".encode()
+        return self._directory / f"{hashlib.sha256(key).hexdigest()}.json"
+
+
+def _derive_verifier(list_password: str, salt: bytes) -> bytes:
+    return hashlib.pbkdf2_hmac(
+        _VERIFIER_HASH, list_password.encode("utf-8"), salt, _VERIFIER_ITERATIONS
+    )
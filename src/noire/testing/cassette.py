@@ -0,0 +1,260 @@
+import collections
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, List, Optional, Union
+from urllib.parse import parse_qsl, urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+# Records the HTTP traffic between a `Noire` client and Mailman, and replays
+# it later without a network. To record, mount a `RecordingAdapter` on the
+# client's session; to replay, mount a `ReplayAdapter`:
+#
+#   cassette = Cassette()
+#   session = requests.Session()
+#   mount(session, RecordingAdapter(cassette))
+#   client = Noire.create_client(list_name, password, base_url, session=session)
+#   ...
+#   cassette.save("list.cassette")
+#
+# Cassettes do not contain the list password, CSRF tokens or cookies, but they
+# do contain the pages Mailman served (e.g., member emails).
+
+CASSETTE_VERSION = 1
+
+# Form fields that are left out when matching requests.
+_IGNORED_FORM_FIELDS = frozenset(["adminpw", "csrf_token"])
+
+# Response headers that are not recorded. Bodies are stored decoded, and
+# cookies are secrets.
+_IGNORED_HEADERS = frozenset(
+    ["content-encoding", "content-length", "transfer-encoding", "set-cookie"]
+)
+
+
+class Interaction:
+    """
+    One recorded response.
+    """
+
+    def __init__(
+        self,
+        status_code: int,
+        headers: Dict[str, str],
+        body: bytes,
+        seconds: float,
+    ) -> None:
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+        # How long the response took to arrive when it was recorded.
+        self.seconds = seconds
+
+
+class Cassette:
+    """
+    Recorded responses, keyed by request.
+
+    A request matches a recording if it has the same method, URL and form
+    fields (ignoring the password and CSRF token). When the same request was
+    recorded more than once, the responses are replayed in the order they were
+    recorded; once they run out, the last one is repeated.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._recorded: Dict[str, List[Interaction]] = {}
+        self._replay_queues: Dict[str, Deque[Interaction]] = {}
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> "Cassette":
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            stored = json.load(file)
+        if stored.get("version") != CASSETTE_VERSION:
+            raise RuntimeError(f"Unsupported cassette version in {path}.")
+        cassette = cls()
+        for key, interactions in stored["interactions"].items():
+            cassette._recorded[key] = [
+                Interaction(
+                    status_code=interaction["status_code"],
+                    headers=interaction["headers"],
+                    # Latin-1 maps each byte to one code point, so any body
+                    # survives the round trip through JSON.
+                    body=interaction["body"].encode("latin-1"),
+                    seconds=interaction["seconds"],
+                )
+                for interaction in interactions
+            ]
+        return cassette
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        with self._lock:
+            stored = {
+                "version": CASSETTE_VERSION,
+                "interactions": {
+                    key: [
+                        {
+                            "status_code": interaction.status_code,
+                            "headers": interaction.headers,
+                            "body": interaction.body.decode("latin-1"),
+                            "seconds": round(interaction.seconds, 6),
+                        }
+                        for interaction in interactions
+                    ]
+                    for key, interactions in self._recorded.items()
+                },
+            }
+        with gzip.open(path, "wt", encoding="utf-8") as file:
+            json.dump(stored, file, ensure_ascii=False, separators=(",", ":"))
+
+    def record(
+        self, request: requests.PreparedRequest, interaction: Interaction
+    ) -> None:
+        key = request_key(request)
+        with self._lock:
+            self._recorded.setdefault(key, []).append(interaction)
+
+    def play(self, request: requests.PreparedRequest) -> Optional[Interaction]:
+        """
+        Returns the next response recorded for `request`, or `None` if the
+        request was never recorded.
+        """
+        key = request_key(request)
+        with self._lock:
+            recorded = self._recorded.get(key)
+            if recorded is None:
+                return None
+            queue = self._replay_queues.get(key)
+            if queue is None:
+                queue = collections.deque(recorded)
+                self._replay_queues[key] = queue
+            if len(queue) > 1:
+                return queue.popleft()
+            return queue[0]
+
+    def rewind(self) -> None:
+        """
+        Replays every request's responses from the start again.
+        """
+        with self._lock:
+            self._replay_queues.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(interactions) for interactions in self._recorded.values())
+
+
+def request_key(request: requests.PreparedRequest) -> str:
+    body = request.body if request.body is not None else ""
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", errors="replace")
+    fields = sorted(
+        (name, value)
+        for name, value in parse_qsl(body, keep_blank_values=True)
+        if name not in _IGNORED_FORM_FIELDS
+    )
+    # Hash the form fields, since some (e.g., emails to add) can be long.
+    digest = hashlib.sha256(urlencode(fields).encode("utf-8")).hexdigest()[:16]
+    return f"{request.method} {request.url} {digest}"
+
+
+class RecordingAdapter(HTTPAdapter):
+    """
+    Sends requests over the network and records their responses in
+    `cassette`.
+    """
+
+    def __init__(self, cassette: Cassette, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._cassette = cassette
+
+    def send(  # type: ignore[override] # pylint: disable=arguments-differ
+        self, request: requests.PreparedRequest, **kwargs: Any
+    ) -> requests.Response:
+        start = time.perf_counter()
+        response = super().send(request, **kwargs)
+        # Reading the content here includes the transfer time in `seconds`.
+        body = response.content
+        self._cassette.record(
+            request,
+            Interaction(
+                status_code=response.status_code,
+                headers={
+                    name: value
+                    for name, value in response.headers.items()
+                    if name.lower() not in _IGNORED_HEADERS
+                },
+                body=body,
+                seconds=time.perf_counter() - start,
+            ),
+        )
+        return response
+
+
+class ReplayAdapter(HTTPAdapter):
+    """
+    Answers requests from `cassette` without using the network.
+
+    Each response is delayed by `latency_seconds` (or, if it is `None`, by the
+    time the response took when it was recorded) plus the time it takes to
+    transfer the body at `bandwidth_bytes_per_second` (if set). Requests that
+    were not recorded raise a `RuntimeError`.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        latency_seconds: Optional[float] = 0.0,
+        bandwidth_bytes_per_second: Optional[float] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self._cassette = cassette
+        self._latency_seconds = latency_seconds
+        self._bandwidth_bytes_per_second = bandwidth_bytes_per_second
+        self._sleep = sleep
+
+    def send(  # type: ignore[override] # pylint: disable=arguments-differ
+        self, request: requests.PreparedRequest, **_kwargs: Any
+    ) -> requests.Response:
+        interaction = self._cassette.play(request)
+        if interaction is None:
+            raise RuntimeError(
+                f"No recorded response for {request.method} {request.url}"
+            )
+
+        delay = (
+            interaction.seconds
+            if self._latency_seconds is None
+            else self._latency_seconds
+        )
+        if self._bandwidth_bytes_per_second is not None:
+            delay += len(interaction.body) / self._bandwidth_bytes_per_second
+        if delay > 0:
+            self._sleep(delay)
+
+        raw = HTTPResponse(
+            body=io.BytesIO(interaction.body),
+            headers=interaction.headers,
+            status=interaction.status_code,
+            preload_content=False,
+            decode_content=False,
+        )
+        return self.build_response(request, raw)
+
+
+def mount(session: requests.Session, adapter: HTTPAdapter) -> requests.Session:
+    """
+    Routes all of `session`'s requests through `adapter`.
+    """
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
@@ -0,0 +1,545 @@
+"""
+A stand-in for a Mailman 2.1 list's web interface, for load testing Noire
+without a real Mailman instance.
+
+`MockMailman` is a WSGI application that serves one list under the paths in
+`noire.constants` (relative to `/mailman`), using the page renderers in
+`noire.testing.pages`. It keeps the list's state in memory, so reads reflect
+earlier writes.
+
+Usage:
+    python -m noire.testing.mock_server --members 100000 --latency-ms 20
+
+and point a client at the printed base URL (the password is "password").
+"""
+
+import argparse
+import html
+import http.cookies
+import random
+import re
+import secrets
+import socketserver
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, parse_qsl, unquote
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from noire.models.membership import (
+    MEMBER_SETTINGS_FLAGS,
+    MemberError,
+    MemberSettings,
+)
+from noire.models.moderation import ModerationRequest, ModerationRequestDetails
+from noire.models.settings import GeneralOptions
+from noire.testing.pages import (
+    render_add_results_page,
+    render_general_options_page,
+    render_login_page,
+    render_members_page,
+    render_moderation_details_page,
+    render_moderation_page,
+    render_remove_results_page,
+    render_roster_page,
+    synthetic_general_options,
+    synthetic_member_settings,
+    synthetic_moderation_requests,
+)
+
+StartResponse = Callable[[str, List[Tuple[str, str]]], Any]
+
+_SCRIPT_PREFIX = "/mailman"
+_EMAIL = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+class MockMailman:
+    """
+    Serves one list, `list_name`, whose admin password is `password`.
+
+    The list starts with `members` synthetic members and `held` messages held
+    for moderation. Every request is delayed by `latency_seconds`, and fails
+    with a 503 response with probability `error_rate`. Changes to the list
+    are serialized, like Mailman does with its list lock, but pages are
+    rendered concurrently.
+    """
+
+    def __init__(
+        self,
+        list_name: str = "mylist",
+        password: str = "password",
+        members: int = 1000,
+        held: int = 20,
+        latency_seconds: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.list_name = list_name
+        self.password = password
+        self.latency_seconds = latency_seconds
+        self.error_rate = error_rate
+        self._sleep = sleep
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._members: Dict[str, MemberSettings] = {
+            settings.email: settings
+            for settings in synthetic_member_settings(members, seed)
+        }
+        # Indexes of the members, rebuilt after the membership changes.
+        self._sorted_emails: Optional[List[str]] = None
+        self._emails_by_letter: Optional[Dict[str, List[str]]] = None
+        self._held: Dict[int, ModerationRequest] = {
+            request.message_id: request
+            for request in synthetic_moderation_requests(held, seed)
+        }
+        self._options = synthetic_general_options()
+        self._privacy: Dict[str, str] = {
+            "accept_these_nonmembers": "",
+            "default_member_moderation": "0",
+        }
+        self._sessions: set = set()
+        # The number of requests served, by method and path.
+        self.request_counts: Dict[Tuple[str, str], int] = {}
+
+    # State accessors, for load tests to check the outcome of their requests.
+
+    def member_emails(self) -> List[str]:
+        with self._lock:
+            return list(self._emails_in_order())
+
+    def member_settings(self, email: str) -> Optional[MemberSettings]:
+        with self._lock:
+            return self._members.get(email)
+
+    def held_message_ids(self) -> List[int]:
+        with self._lock:
+            return sorted(self._held)
+
+    def general_options(self) -> GeneralOptions:
+        with self._lock:
+            return self._options
+
+    def privacy_options(self) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._privacy)
+
+    def expire_sessions(self) -> None:
+        """
+        Logs out every client, as if their session cookies expired.
+        """
+        with self._lock:
+            self._sessions.clear()
+
+    def __call__(self, environ: Dict[str, Any], start_response: StartResponse):
+        method = environ["REQUEST_METHOD"]
+        path = environ.get("PATH_INFO", "").rstrip("/")
+        with self._lock:
+            key = (method, path)
+            self.request_counts[key] = self.request_counts.get(key, 0) + 1
+            fail = self._random.random() < self.error_rate
+        if self.latency_seconds > 0:
+            self._sleep(self.latency_seconds)
+        if fail:
+            return _respond(start_response, "503 Service Unavailable", "Try again.")
+
+        query = parse_qs(environ.get("QUERY_STRING", ""), keep_blank_values=True)
+        form: List[Tuple[str, str]] = []
+        if method == "POST":
+            length = int(environ.get("CONTENT_LENGTH") or 0)
+            body = environ["wsgi.input"].read(length).decode("utf-8")
+            form = parse_qsl(body, keep_blank_values=True)
+
+        handler = self._route(path)
+        if handler is None:
+            return _respond(start_response, "404 Not Found", "Not found.")
+        public = path == f"{_SCRIPT_PREFIX}/roster/{self.list_name}"
+        fields = dict(form)
+        if path == f"{_SCRIPT_PREFIX}/admin/{self.list_name}" and method == "POST":
+            return self._log_in(fields, start_response)
+        if not public and not self._is_authenticated(environ, fields):
+            return _respond(start_response, "200 OK", render_login_page(self.list_name))
+        return _respond(start_response, "200 OK", handler(method, query, form))
+
+    def _route(
+        self, path: str
+    ) -> Optional[Callable[[str, Dict[str, List[str]], List[Tuple[str, str]]], str]]:
+        admin = f"{_SCRIPT_PREFIX}/admin/{self.list_name}"
+        routes = {
+            admin: self._general,
+            f"{admin}/general": self._general,
+            f"{admin}/members": self._members_page,
+            f"{admin}/members/add": self._add,
+            f"{admin}/members/remove": self._remove,
+            f"{admin}/members/sync": self._sync,
+            f"{admin}/privacy/sender": self._privacy_sender,
+            f"{_SCRIPT_PREFIX}/admindb/{self.list_name}": self._admindb,
+            f"{_SCRIPT_PREFIX}/roster/{self.list_name}": self._roster,
+        }
+        return routes.get(path)
+
+    def _log_in(self, fields: Dict[str, str], start_response: StartResponse):
+        if fields.get("adminpw") != self.password:
+            return _respond(
+                start_response,
+                "401 Unauthorized",
+                render_login_page(self.list_name, "Authorization failed."),
+            )
+        token = secrets.token_hex(16)
+        with self._lock:
+            self._sessions.add(token)
+        cookie = f"{self.list_name}+admin={token}; Path=/mailman"
+        return _respond(
+            start_response,
+            "200 OK",
+            render_general_options_page(self.general_options(), self.list_name),
+            [("Set-Cookie", cookie)],
+        )
+
+    def _is_authenticated(
+        self, environ: Dict[str, Any], fields: Dict[str, str]
+    ) -> bool:
+        # Like Mailman, accept the password in place of a session.
+        if fields.get("adminpw") == self.password:
+            return True
+        cookies = http.cookies.SimpleCookie(environ.get("HTTP_COOKIE", ""))
+        morsel = cookies.get(f"{self.list_name}+admin")
+        if morsel is None:
+            return False
+        with self._lock:
+            return morsel.value in self._sessions
+
+    # The following three methods must be called with the lock held.
+
+    def _emails_in_order(self) -> List[str]:
+        if self._sorted_emails is None:
+            self._sorted_emails = sorted(self._members)
+        return self._sorted_emails
+
+    def _emails_in_letters(self) -> Dict[str, List[str]]:
+        if self._emails_by_letter is None:
+            self._emails_by_letter = _group_by_letter(self._emails_in_order())
+        return self._emails_by_letter
+
+    def _membership_changed(self) -> None:
+        self._sorted_emails = None
+        self._emails_by_letter = None
+
+    def _members_page(
+        self, method: str, query: Dict[str, List[str]], form: List[Tuple[str, str]]
+    ) -> str:
+        fields = dict(form)
+        if method == "POST" and "setmemberopts_btn" in fields:
+            self._set_member_options(form)
+        elif method == "POST" and "allmodbit_btn" in fields:
+            moderated = fields.get("allmodbit_val") == "1"
+            with self._lock:
+                for email, settings in self._members.items():
+                    self._members[email] = settings.model_copy(
+                        update={"moderated": moderated}
+                    )
+
+        findmember = fields.get("findmember", query.get("findmember", [""])[0])
+        with self._lock:
+            chunk_size = max(1, self._options.admin_member_chunksize)
+            total = len(self._members)
+            if findmember:
+                emails = _search(self._emails_in_order(), findmember)
+                by_letter = _group_by_letter(emails)
+            else:
+                emails = self._emails_in_order()
+                by_letter = self._emails_in_letters()
+
+            # Mailman shows everything on one page if it fits. Otherwise, it
+            # groups members by the first letter of their address and splits
+            # each letter into chunks.
+            if len(emails) <= chunk_size:
+                shown = [self._members[email] for email in emails]
+                letters: List[str] = []
+            else:
+                letters = sorted(by_letter)
+                letter = query.get("letter", [letters[0]])[0].lower()
+                in_letter = by_letter.get(letter, [])
+                chunks = [
+                    in_letter[i : i + chunk_size]
+                    for i in range(0, len(in_letter), chunk_size)
+                ]
+                chunk = int(query.get("chunk", ["0"])[0])
+                if not 0 <= chunk < len(chunks):
+                    chunk = 0
+                shown = (
+                    [self._members[email] for email in chunks[chunk]] if chunks else []
+                )
+
+        if len(letters) == 0:
+            return render_members_page(
+                shown, self.list_name, total, findmember=findmember
+            )
+        return render_members_page(
+            shown,
+            self.list_name,
+            total,
+            letters=letters,
+            current_letter=letter,
+            chunk_ranges=[(members[0], members[-1]) for members in chunks],
+            current_chunk=chunk,
+            findmember=findmember,
+        )
+
+    def _set_member_options(self, form: List[Tuple[str, str]]) -> None:
+        submitted = {name for name, _ in form}
+        with self._lock:
+            for name, value in form:
+                if name != "user":
+                    continue
+                email = unquote(value)
+                settings = self._members.get(email)
+                if settings is None:
+                    continue
+                enabled = {
+                    html_name: f"{value}_{html_name}" in submitted
+                    for _, html_name in MEMBER_SETTINGS_FLAGS
+                }
+                self._members[email] = MemberSettings.from_html_values(email, enabled)
+
+    def _add(self, _method: str, _query: Any, form: List[Tuple[str, str]]) -> str:
+        added, errors = self._subscribe(_lines(dict(form).get("subscribees", "")))
+        return render_add_results_page(added, errors, self.list_name)
+
+    def _remove(self, _method: str, _query: Any, form: List[Tuple[str, str]]) -> str:
+        removed, not_members = self._unsubscribe(
+            _lines(dict(form).get("unsubscribees", ""))
+        )
+        return render_remove_results_page(removed, not_members, self.list_name)
+
+    def _sync(self, _method: str, _query: Any, form: List[Tuple[str, str]]) -> str:
+        wanted = _lines(dict(form).get("memberlist", ""))
+        wanted_set = set(wanted)
+        with self._lock:
+            extra = [email for email in self._members if email not in wanted_set]
+        removed, _ = self._unsubscribe(extra)
+        added, errors = self._subscribe(wanted)
+        return render_add_results_page(
+            added, errors, self.list_name
+        ) + render_remove_results_page(removed, list_name=self.list_name)
+
+    def _subscribe(self, emails: List[str]) -> Tuple[List[str], List[MemberError]]:
+        added: List[str] = []
+        errors: List[MemberError] = []
+        with self._lock:
+            for email in emails:
+                if _EMAIL.match(email) is None:
+                    errors.append(
+                        MemberError(
+                            email=email, error_reason="Bad/Invalid email address"
+                        )
+                    )
+                elif email in self._members:
+                    errors.append(
+                        MemberError(email=email, error_reason="Already a member")
+                    )
+                else:
+                    self._members[email] = MemberSettings(
+                        email=email,
+                        moderated=self._privacy["default_member_moderation"] == "1",
+                        hide=False,
+                        no_mail=False,
+                        ack=False,
+                        not_me_too=False,
+                        no_dupes=True,
+                        digest=False,
+                        plain=False,
+                    )
+                    added.append(email)
+            if added:
+                self._membership_changed()
+        return added, errors
+
+    def _unsubscribe(self, emails: List[str]) -> Tuple[List[str], List[str]]:
+        removed: List[str] = []
+        not_members: List[str] = []
+        with self._lock:
+            for email in emails:
+                if self._members.pop(email, None) is None:
+                    not_members.append(email)
+                else:
+                    removed.append(email)
+            if removed:
+                self._membership_changed()
+        return removed, not_members
+
+    def _admindb(
+        self, method: str, query: Dict[str, List[str]], form: List[Tuple[str, str]]
+    ) -> str:
+        if method == "POST":
+            with self._lock:
+                for name, value in form:
+                    # 0 defers the message; the other actions resolve it.
+                    if name.isdigit() and value in ("1", "2", "3"):
+                        self._held.pop(int(name), None)
+        if "msgid" in query:
+            message_id = int(query["msgid"][0])
+            with self._lock:
+                request = self._held.get(message_id)
+            if request is None:
+                return render_moderation_details_page(None, list_name=self.list_name)
+            details = ModerationRequestDetails(
+                message_id=message_id,
+                message_headers=(
+                    f"From: {request.sender_email}\nSubject: {request.subject}\n"
+                ),
+                message_contents=f"This is held message {message_id}.\n",
+            )
+            return render_moderation_details_page(details, request, self.list_name)
+        with self._lock:
+            held = list(self._held.values())
+        return render_moderation_page(held, self.list_name)
+
+    def _general(self, method: str, _query: Any, form: List[Tuple[str, str]]) -> str:
+        if method == "POST":
+            fields = dict(form)
+            with self._lock:
+                update: Dict[str, Any] = {}
+                for field, field_info in GeneralOptions.model_fields.items():
+                    if field not in fields:
+                        continue
+                    if field_info.annotation is bool:
+                        update[field] = fields[field] == "1"
+                    elif field_info.annotation is int:
+                        update[field] = int(fields[field])
+                    else:
+                        update[field] = fields[field]
+                self._options = self._options.model_copy(update=update)
+        return render_general_options_page(self.general_options(), self.list_name)
+
+    def _privacy_sender(
+        self, method: str, _query: Any, form: List[Tuple[str, str]]
+    ) -> str:
+        if method == "POST":
+            fields = dict(form)
+            with self._lock:
+                for name in self._privacy:
+                    if name in fields:
+                        self._privacy[name] = fields[name]
+        with self._lock:
+            values = dict(self._privacy)
+        return (
+            f"<HTML><HEAD><TITLE>{self.list_name} Administration (Privacy Options)"
+            "</TITLE></HEAD><BODY>\n"
+            + "".join(
+                f'<INPUT name="{name}" type="HIDDEN" value="{html.escape(value)}" >\n'
+                for name, value in values.items()
+            )
+            + "</BODY></HTML>\n"
+        )
+
+    def _roster(self, _method: str, _query: Any, _form: Any) -> str:
+        with self._lock:
+            emails = self._emails_in_order()
+            regular = [email for email in emails if not self._members[email].digest]
+            digest = [email for email in emails if self._members[email].digest]
+            disabled = [email for email in emails if self._members[email].no_mail]
+        return render_roster_page(regular, digest, self.list_name, disabled)
+
+
+class _ThreadingWSGIServer(socketserver.ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def serve(
+    app: MockMailman, host: str = "127.0.0.1", port: int = 0
+) -> Tuple[WSGIServer, str]:
+    """
+    Starts serving `app` on a background thread. Returns the server (call
+    `shutdown()` to stop it) and the Mailman base URL to give to clients.
+    """
+    server = make_server(
+        host, port, app, server_class=_ThreadingWSGIServer, handler_class=_QuietHandler
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}{_SCRIPT_PREFIX}"
+
+
+def _respond(
+    start_response: StartResponse,
+    status: str,
+    body: str,
+    headers: Iterable[Tuple[str, str]] = (),
+) -> List[bytes]:
+    encoded = body.encode("utf-8")
+    start_response(
+        status,
+        [
+            ("Content-Type", "text/html; charset=us-ascii"),
+            ("Content-Length", str(len(encoded))),
+            *headers,
+        ],
+    )
+    return [encoded]
+
+
+def _search(emails: List[str], findmember: str) -> List[str]:
+    # Mailman treats the search string as a case-insensitive regex.
+    try:
+        pattern = re.compile(findmember, re.IGNORECASE)
+    except re.error:
+        pattern = re.compile(re.escape(findmember), re.IGNORECASE)
+    return [email for email in emails if pattern.search(email) is not None]
+
+
+def _group_by_letter(emails: List[str]) -> Dict[str, List[str]]:
+    by_letter: Dict[str, List[str]] = {}
+    for email in emails:
+        by_letter.setdefault(email[0].lower(), []).append(email)
+    return by_letter
+
+
+def _lines(value: str) -> List[str]:
+    return [line.strip() for line in value.splitlines() if len(line.strip()) > 0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--list", default="mylist", help="The list's name.")
+    parser.add_argument("--password", default="password")
+    parser.add_argument("--members", type=int, default=1000)
+    parser.add_argument("--held", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction of requests to fail."
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    app = MockMailman(
+        list_name=args.list,
+        password=args.password,
+        members=args.members,
+        held=args.held,
+        latency_seconds=args.latency_ms / 1000,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    server = make_server(
+        args.host,
+        args.port,
+        app,
+        server_class=_ThreadingWSGIServer,
+        handler_class=_QuietHandler,
+    )
+    print(f"Serving {args.list} at http://{args.host}:{args.port}{_SCRIPT_PREFIX}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
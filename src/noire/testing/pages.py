@@ -0,0 +1,525 @@
+import random
+from datetime import datetime, timedelta
+from html import escape
+from typing import List, Optional, Sequence, Tuple
+from urllib.parse import quote, quote_plus
+
+from noire.models.membership import MemberError, MemberSettings
+from noire.models.moderation import ModerationRequest, ModerationRequestDetails
+from noire.models.settings import GeneralOptions
+
+# These functions render pages that mimic the HTML served by Mailman 2.1's web
+# interface (including its quirks, such as unclosed <li> tags). They are used
+# to exercise Noire's parsers without a real Mailman instance.
+
+_WORDS = [
+    "alpha",
+    "bravo",
+    "charlie",
+    "delta",
+    "echo",
+    "foxtrot",
+    "golf",
+    "hotel",
+    "india",
+    "juliet",
+    "kilo",
+    "lima",
+    "mike",
+    "november",
+    "oscar",
+    "papa",
+    "quebec",
+    "romeo",
+    "sierra",
+    "tango",
+]
+_DOMAINS = ["example.com", "example.org", "mail.example.net", "lists.example.edu"]
+
+_MEMBER_FLAGS = [
+    ("mod", "moderated"),
+    ("hide", "hide"),
+    ("nomail", "no_mail"),
+    ("ack", "ack"),
+    ("notmetoo", "not_me_too"),
+    ("nodupes", "no_dupes"),
+    ("digest", "digest"),
+    ("plain", "plain"),
+]
+
+
+def synthetic_emails(count: int, seed: int = 0) -> List[str]:
+    """
+    Generates `count` distinct, deterministic email addresses.
+    """
+    rng = random.Random(seed)
+    emails = []
+    for i in range(count):
+        local = f"{rng.choice(_WORDS)}.{rng.choice(_WORDS)}{i}"
+        if rng.random() < 0.05:
+            local = local.replace(".", "_")
+        if rng.random() < 0.02:
+            local = local + "+lists"
+        emails.append(f"{local}@{rng.choice(_DOMAINS)}")
+    return emails
+
+
+def synthetic_member_settings(count: int, seed: int = 0) -> List[MemberSettings]:
+    rng = random.Random(seed)
+    settings = []
+    for email in synthetic_emails(count, seed):
+        digest = rng.random() < 0.2
+        settings.append(
+            MemberSettings(
+                email=email,
+                moderated=rng.random() < 0.1,
+                hide=rng.random() < 0.05,
+                no_mail=rng.random() < 0.05,
+                ack=rng.random() < 0.1,
+                not_me_too=rng.random() < 0.5,
+                no_dupes=rng.random() < 0.5,
+                digest=digest,
+                plain=digest and rng.random() < 0.5,
+            )
+        )
+    return settings
+
+
+def synthetic_moderation_requests(count: int, seed: int = 0) -> List[ModerationRequest]:
+    rng = random.Random(seed)
+    senders = synthetic_emails(max(1, count // 3), seed + 1)
+    start = datetime(2024, 1, 1, 8, 30, 0)
+    requests = []
+    for i in range(count):
+        requests.append(
+            ModerationRequest(
+                message_id=i + 1,
+                sender_email=rng.choice(senders),
+                subject=f"Re: {rng.choice(_WORDS)} {rng.choice(_WORDS)} ({i})",
+                size_description=f"{rng.randint(800, 90000)} bytes",
+                reason=rng.choice(
+                    [
+                        "Post by non-member to a members-only list",
+                        "Message has implicit destination",
+                        "Message body is too big: 91234 bytes with a limit of 40 KB",
+                    ]
+                ),
+                received_date=start + timedelta(minutes=37 * i),
+            )
+        )
+    return requests
+
+
+def synthetic_general_options() -> GeneralOptions:
+    return GeneralOptions(
+        send_reminders=True,
+        welcome_msg="Welcome to the list!\n\nPlease read the FAQ.",
+        send_welcome_msg=True,
+        goodbye_msg="",
+        send_goodbye_msg=False,
+        admin_immed_notify=True,
+        admin_notify_mchanges=False,
+        respond_to_post_requests=True,
+        admin_member_chunksize=30,
+    )
+
+
+def render_members_page(
+    members: Sequence[MemberSettings],
+    list_name: str = "mylist",
+    total_members: Optional[int] = None,
+    letters: Sequence[str] = (),
+    current_letter: Optional[str] = None,
+    chunk_ranges: Sequence[Tuple[str, str]] = (),
+    current_chunk: int = 0,
+    findmember: str = "",
+) -> str:
+    """
+    Renders `/admin/<list>/members`. When the list has more members than the
+    chunk size, Mailman groups members by the first letter of their address
+    (`letters`) and splits each letter into chunks (`chunk_ranges` holds the
+    first and last address of every chunk in the current letter).
+    """
+    admin_url = f"/mailman/admin/{list_name}"
+    if total_members is None:
+        total_members = len(members)
+    out = [_page_header(f"{list_name} Administration (Membership Management)")]
+    query = f"?letter={current_letter}&chunk={current_chunk}" if current_letter else ""
+    out.append(f'<FORM action="{admin_url}/members{query}" method="POST" >\n')
+    out.append(
+        '<table WIDTH="100%" BORDER="0" CELLSPACING="3" CELLPADDING="4">\n'
+        '<tr><td COLSPAN="2" WIDTH="100%" BGCOLOR="#99ccff" ALIGN="CENTER">'
+        '<B><FONT COLOR="#000000" SIZE="+1">Membership List</FONT></B></td></tr>\n'
+        "</table>\n"
+    )
+    out.append(
+        '<table WIDTH="100%">\n<tr><td>Find member '
+        f'<INPUT name="findmember" type="TEXT" value="{escape(findmember)}" size="20" >'
+        '<INPUT name="findmember_btn" type="SUBMIT" value="Search..." >'
+        "</td></tr>\n</table>\n"
+    )
+    out.append('<center><table width="90%" border="2">\n')
+    if current_letter:
+        out.append(
+            '<tr><td COLSPAN="11" BGCOLOR="#dddddd"><center><em>'
+            f"{total_members} members total, {len(members)} shown"
+            "</em></center></td></tr>\n"
+        )
+        findfrag = f"&findmember={quote(findmember)}" if findmember else ""
+        cells = []
+        for letter in letters:
+            show = (
+                f"<b>[{letter.upper()}]</b>"
+                if letter == current_letter
+                else letter.upper()
+            )
+            cells.append(
+                f'<a href="{admin_url}/members?letter={letter}{findfrag}">{show}</a>'
+            )
+        out.append(
+            '<tr><td COLSPAN="11" BGCOLOR="#dddddd"><center>'
+            + "&nbsp;&nbsp;\n".join(cells)
+            + "</center></td></tr>\n"
+        )
+    else:
+        out.append(
+            '<tr><td COLSPAN="11" BGCOLOR="#dddddd"><center><em>'
+            f"{total_members} members total"
+            "</em></center></td></tr>\n"
+        )
+    out.append(
+        "<tr><td><center>unsub</center></td>"
+        "<td><center>member address<br>member name</center></td>"
+        "<td><center>mod</center></td><td><center>hide</center></td>"
+        "<td><center>nomail<br>[reason]</center></td>"
+        "<td><center>ack</center></td><td><center>not metoo</center></td>"
+        "<td><center>nodupes</center></td><td><center>digest</center></td>"
+        "<td><center>plain</center></td><td><center>language</center></td></tr>\n"
+    )
+    for member in members:
+        out.append(_render_member_row(member, list_name))
+    out.append("</table>\n</center>\n")
+    if chunk_ranges and current_letter:
+        out.append(
+            "<p><em>To view more members, click on the appropriate\n"
+            "        range listed below:</em>\n<ul>\n"
+        )
+        for i, (start, end) in enumerate(chunk_ranges):
+            if i == current_chunk:
+                continue
+            out.append(
+                f'<li><a href="{admin_url}/members?letter={current_letter}&chunk={i}">'
+                f"from {start} to {end}</a>\n"
+            )
+        out.append("</ul>\n<p>")
+    out.append(
+        '<INPUT name="setmemberopts_btn" type="SUBMIT" value="Submit Your Changes" >\n'
+        "</FORM>\n"
+    )
+    out.append(_page_footer())
+    return "".join(out)
+
+
+def _render_member_row(member: MemberSettings, list_name: str) -> str:
+    qaddr = quote(member.email)
+    obscured = member.email.replace("@", "--at--")
+    cells = [
+        '<td><center><INPUT name="%s_unsub" type="CHECKBOX" value="off" >'
+        '<div class="hidden">unsub</div></center></td>' % qaddr,
+        '<td><a href="/mailman/options/%s/%s">%s</a><br>'
+        '<INPUT name="%s_realname" type="TEXT" value="" size="28" >'
+        '<INPUT name="user" type="HIDDEN" value="%s" ></td>'
+        % (list_name, obscured, member.email, qaddr, qaddr),
+    ]
+    for html_name, field in _MEMBER_FLAGS:
+        enabled = getattr(member, field)
+        cells.append(
+            '<td><center><INPUT name="%s_%s" type="CHECKBOX" value="%s" %s>'
+            '<div class="hidden">%s</div></center></td>'
+            % (
+                qaddr,
+                html_name,
+                "on" if enabled else "off",
+                "CHECKED " if enabled else "",
+                html_name,
+            )
+        )
+    cells.append(
+        '<td><center><Select name="%s_language">\n'
+        '<option value="en" Selected> English (USA) </option>\n'
+        "</Select>\n</center></td>" % qaddr
+    )
+    return "<tr>" + "".join(cells) + "</tr>\n"
+
+
+def render_roster_page(
+    emails: Sequence[str],
+    digest_emails: Sequence[str] = (),
+    list_name: str = "mylist",
+    disabled: Sequence[str] = (),
+) -> str:
+    """
+    Renders `/roster/<list>`. Addresses are obscured as "user at domain", and
+    members with delivery disabled are wrapped in italics and parentheses.
+    """
+    disabled_set = set(disabled)
+    out = [_page_header(f"{list_name} subscribers")]
+    out.append(
+        '<table BORDER="0" WIDTH="100%">\n<tr><td WIDTH="100%" BGCOLOR="#99ccff">'
+        f'<B><FONT SIZE="+2">{list_name} subscribers</FONT></B></td></tr>\n'
+        "<tr><td><p>Click on a link to visit your options page.<br>"
+        "(<i>Entries in parenthesis have list delivery disabled.</i>)</td></tr>\n"
+        '<tr><td><a href="/mailman/listinfo/mylist">Back to the list information page</a>'
+        "</td></tr>\n</table>\n"
+    )
+    for title, group in (
+        ("Non-digested members", emails),
+        ("Digested members", digest_emails),
+    ):
+        out.append(
+            '<table BORDER="2" WIDTH="100%"><tr><td BGCOLOR="#FFF0D0">'
+            f"<center><B>{len(group)} {title}:</b></center></td></tr>\n<tr><td>\n<ul>\n"
+        )
+        for email in group:
+            link = '<a href="/mailman/options/%s/%s">%s</a>' % (
+                list_name,
+                email.replace("@", "--at--"),
+                email.replace("@", " at "),
+            )
+            if email in disabled_set:
+                link = f"<i>({link})</i>"
+            out.append(f"<li>{link}\n")
+        out.append("</ul>\n</td></tr></table>\n")
+    out.append(_page_footer())
+    return "".join(out)
+
+
+def render_moderation_page(
+    requests: Sequence[ModerationRequest], list_name: str = "mylist"
+) -> str:
+    """
+    Renders the overview at `/admindb/<list>`, where held messages are grouped
+    by sender.
+    """
+    admindb_url = f"http://lists.example.com/mailman/admindb/{list_name}"
+    out = [_page_header(f"{list_name} Administrative Database")]
+    out.append(
+        f'<FORM action="{admindb_url}" method="POST" >\n'
+        '<center><INPUT name="submit" type="SUBMIT" value="Submit All Data" ></center>\n'
+    )
+    by_sender: dict = {}
+    for request in requests:
+        by_sender.setdefault(request.sender_email, []).append(request)
+    if by_sender:
+        out.append("<hr>\n<center><h2>Held Messages</h2></center>\n")
+        out.append("<table>\n")
+    for sender in sorted(by_sender):
+        qsender = quote_plus(sender)
+        esender = escape(sender)
+        out.append('<tr><td><table border="1">\n')
+        out.append(
+            f'<tr><td COLSPAN="2"><center><strong>From:</strong>{esender}</center></td></tr>\n'
+        )
+        out.append("<tr><td>")
+        out.append(
+            '<table>\n<tr><td COLSPAN="2">Action to take on all these held messages:</td></tr>\n'
+            '<tr><td COLSPAN="2"><table><tr>'
+            + "".join(
+                f"<td><center>{label}</center></td>"
+                for label in ("Defer", "Accept", "Reject", "Discard")
+            )
+            + "</tr><tr>"
+            + "".join(
+                f'<td><center><input type=radio name="senderaction-{qsender}" '
+                f'value="{value}" {"CHECKED" if value == 0 else ""}></center></td>'
+                for value in range(4)
+            )
+            + "</tr></table></td></tr>\n"
+            f'<tr><td COLSPAN="2"><INPUT name="senderpreserve-{qsender}" type="CHECKBOX" value="1" >'
+            "&nbsp;Preserve messages for the site administrator</td></tr>\n"
+            f'<tr><td COLSPAN="2"><INPUT name="senderforward-{qsender}" type="CHECKBOX" value="1" >'
+            "&nbsp;Forward messages (individually) to:</td></tr>\n"
+            "</table>\n"
+        )
+        out.append("</td><td>")
+        out.append(
+            '<table>\n<tr><td COLSPAN="2">Click on the message number to view the individual\n'
+            f'            message, or you can <a href="{admindb_url}?sender={qsender}">'
+            f"view all messages from {esender}</a></td></tr>\n"
+            "<tr><td>&nbsp;</td><td>&nbsp;</td></tr>\n"
+        )
+        for counter, request in enumerate(by_sender[sender], start=1):
+            out.append(
+                "<tr><td><table>\n"
+                f'<tr><td><a href="{admindb_url}?msgid={request.message_id}">[{counter}]</a></td>'
+                f"<td><strong>Subject:</strong></td><td>{escape(request.subject)}</td></tr>\n"
+                "<tr><td>&nbsp;</td><td><strong>Size:</strong></td>"
+                f"<td>{request.size_description}</td></tr>\n"
+                "<tr><td>&nbsp;</td><td><strong>Reason:</strong></td>"
+                f"<td>{escape(request.reason)}</td></tr>\n"
+                "<tr><td>&nbsp;</td><td><strong>Received:</strong></td>"
+                f"<td>{request.received_date.strftime('%a %b %d %H:%M:%S %Y')}</td></tr>\n"
+                f'<tr><td><INPUT name="{qsender}" type="hidden" value="{request.message_id}" ></td></tr>\n'
+                "</table>\n</td></tr>\n"
+            )
+        out.append("</table>\n</td></tr>\n</table>\n</td></tr>\n")
+    if by_sender:
+        out.append("</table>\n")
+    else:
+        out.append("<p>There are no pending requests.\n")
+    out.append("</FORM>\n")
+    out.append(_page_footer())
+    return "".join(out)
+
+
+def render_moderation_details_page(
+    details: Optional[ModerationRequestDetails],
+    request: Optional[ModerationRequest] = None,
+    list_name: str = "mylist",
+) -> str:
+    """
+    Renders `/admindb/<list>?msgid=<id>`. If `details` is `None`, the page
+    reports that the message is no longer held.
+    """
+    out = [_page_header(f"{list_name} Administrative Database")]
+    if details is None:
+        out.append("<p><em>Message not found; it may already have been handled.</em>\n")
+        out.append(_page_footer())
+        return "".join(out)
+    sender = request.sender_email if request is not None else "unknown@example.com"
+    subject = request.subject if request is not None else ""
+    reason = request.reason if request is not None else "not available"
+    mid = details.message_id
+    out.append(
+        '<hr>\n<table CELLSPACING="0" CELLPADDING="0" WIDTH="100%">\n'
+        f"<tr><td><strong>From:</strong></td><td>{escape(sender)}</td></tr>\n"
+        f"<tr><td><strong>Subject:</strong></td><td>{escape(subject)}</td></tr>\n"
+        f"<tr><td><strong>Reason:</strong></td><td>{escape(reason)}</td></tr>\n"
+        "<tr><td><strong>Action:</strong></td><td>"
+        + "".join(
+            f'<input type=radio name="{mid}" value="{value}" {"CHECKED" if value == 0 else ""}>'
+            for value in range(4)
+        )
+        + "</td></tr>\n"
+        "<tr><td><strong>Message Headers:</strong></td><td>"
+        f"<TEXTAREA NAME=headers-{mid} ROWS=10 COLS=80 WRAP=soft READONLY>"
+        f"{escape(details.message_headers, quote=False)}</TEXTAREA></td></tr>\n"
+        "<tr><td><strong>Message Excerpt:</strong></td><td>"
+        f"<TEXTAREA NAME=fulltext-{mid} ROWS=10 COLS=80 WRAP=soft READONLY>"
+        f"{escape(details.message_contents, quote=False)}</TEXTAREA></td></tr>\n"
+        "</table>\n"
+    )
+    out.append(_page_footer())
+    return "".join(out)
+
+
+def render_general_options_page(
+    options: GeneralOptions, list_name: str = "mylist"
+) -> str:
+    """
+    Renders `/admin/<list>/general`. Only the options modelled by
+    `GeneralOptions` are included, plus a few unrelated form controls.
+    """
+    out = [_page_header(f"{list_name} Administration (General Options)")]
+    out.append(
+        f'<FORM action="/mailman/admin/{list_name}/general" method="POST" >\n'
+        '<table WIDTH="100%" BORDER="0" CELLSPACING="3" CELLPADDING="4">\n'
+        '<tr><td><div id="real_name">List name</div></td><td>'
+        f'<INPUT name="real_name" type="TEXT" value="{list_name}" size="40" ></td></tr>\n'
+        '<tr><td><div id="description">Description</div></td><td>'
+        '<INPUT name="description" type="TEXT" value="A synthetic list" size="40" ></td></tr>\n'
+    )
+    for field, field_info in GeneralOptions.model_fields.items():
+        value = getattr(options, field)
+        out.append(f'<tr><td><div id="{field}">{field}</div></td><td>')
+        if field_info.annotation is bool:
+            out.append(
+                f'<INPUT name="{field}" type="RADIO" value="0" {"" if value else "CHECKED "}>No '
+                f'<INPUT name="{field}" type="RADIO" value="1" {"CHECKED " if value else ""}>Yes'
+            )
+        elif field_info.annotation is int:
+            out.append(f'<INPUT name="{field}" type="TEXT" value="{value}" size="5" >')
+        else:
+            out.append(
+                f"<TEXTAREA NAME={field} ROWS=4 COLS=40 WRAP=soft>"
+                f"{escape(value, quote=False)}</TEXTAREA>"
+            )
+        out.append("</td></tr>\n")
+    out.append(
+        "</table>\n"
+        '<INPUT name="submit" type="SUBMIT" value="Submit Your Changes" >\n</FORM>\n'
+    )
+    out.append(_page_footer())
+    return "".join(out)
+
+
+def render_add_results_page(
+    added: Sequence[str], errors: Sequence[MemberError], list_name: str = "mylist"
+) -> str:
+    out = [_page_header(f"{list_name} Administration (Membership Management)")]
+    if added:
+        out.append("<h5>Successfully subscribed:</h5>" + _unordered_list(added))
+    if errors:
+        items = [
+            (
+                error.email
+                if error.error_reason is None
+                else f"{error.email} -- {error.error_reason}"
+            )
+            for error in errors
+        ]
+        out.append("<h5>Error subscribing:</h5>" + _unordered_list(items))
+    out.append(_page_footer())
+    return "".join(out)
+
+
+def render_remove_results_page(
+    removed: Sequence[str],
+    not_members: Sequence[str] = (),
+    list_name: str = "mylist",
+) -> str:
+    out = [_page_header(f"{list_name} Administration (Membership Management)")]
+    if removed:
+        out.append("<h5>Successfully Unsubscribed:</h5>" + _unordered_list(removed))
+    if not_members:
+        out.append(
+            "<h3><em>Cannot unsubscribe non-members:</em></h3>"
+            + _unordered_list(not_members)
+        )
+    out.append(_page_footer())
+    return "".join(out)
+
+
+def render_login_page(list_name: str = "mylist", message: str = "") -> str:
+    return (
+        _page_header(f"{list_name} Administrative Authentication")
+        + f'<FORM METHOD=POST ACTION="/mailman/admin/{list_name}/">\n'
+        + message
+        + '<TABLE WIDTH="100%" BORDER="0" CELLSPACING="4" CELLPADDING="5">\n'
+        "<tr><td>List Administrator Password:</td>"
+        '<td><INPUT TYPE="password" NAME="adminpw" SIZE="30"></td></tr>\n'
+        '<tr><td colspan=2><INPUT type="SUBMIT" name="admlogin" value="Let me in..."></td></tr>\n'
+        "</TABLE></FORM>\n" + _page_footer()
+    )
+
+
+def _unordered_list(items: Sequence[str]) -> str:
+    # Mailman does not close its <li> tags.
+    return "\n<ul>\n" + "".join(f"<li>{item}\n" for item in items) + "</ul>\n"
+
+
+def _page_header(title: str) -> str:
+    return (
+        '<!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 4.01 Transitional//EN">\n'
+        '<HTML>\n<HEAD>\n<META http-equiv="Content-Type" content="text/html; charset=us-ascii">\n'
+        f"<TITLE>{escape(title)}</TITLE>\n</HEAD>\n"
+        '<BODY bgcolor="white" dir="ltr">\n'
+    )
+
+
+def _page_footer() -> str:
+    return (
+        '<hr><address><table WIDTH="100%">\n<tr><td>'
+        '<img src="/icons/mailman.jpg" alt="Delivered by Mailman" border=0>'
+        "<br>version 2.1.39</td></tr>\n</table>\n</address>\n</BODY>\n</HTML>\n"
+    )
@@ -0,0 +1,139 @@
+import random
+import threading
+import time
+from typing import Any, Callable, Optional
+
+import requests
+
+# Statuses that indicate an overloaded (or briefly unavailable) server.
+RETRYABLE_STATUS_CODES = frozenset([429, 502, 503, 504])
+
+
+class Transport:
+    """
+    Sends HTTP requests to Mailman on behalf of one or more clients.
+
+    - Every request uses a timeout.
+    - Safe requests (GETs, and POSTs that can be repeated without changing
+      their effect) are retried on connection errors, timeouts and overloaded
+      server responses, with jittered exponential backoff.
+    - The number of requests in flight is limited. The limit is adjusted using
+      additive increase, multiplicative decrease (AIMD): it halves whenever a
+      request fails or is slower than `target_latency_seconds`, and grows back
+      by about one request per round trip otherwise.
+
+    Clients that talk to the same Mailman host should share one transport so
+    that they share the concurrency limit.
+    """
+
+    def __init__(
+        self,
+        timeout_seconds: float = 60.0,
+        max_retries: int = 3,
+        backoff_base_seconds: float = 0.5,
+        backoff_max_seconds: float = 30.0,
+        max_concurrency: int = 8,
+        target_latency_seconds: Optional[float] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._timeout_seconds = timeout_seconds
+        self._max_retries = max_retries
+        self._backoff_base_seconds = backoff_base_seconds
+        self._backoff_max_seconds = backoff_max_seconds
+        self._target_latency_seconds = target_latency_seconds
+        self._sleep = sleep
+        self._limiter = _ConcurrencyLimiter(max_concurrency)
+
+    @property
+    def concurrency_limit(self) -> int:
+        """
+        The current limit on the number of requests in flight.
+        """
+        return self._limiter.limit
+
+    def request(
+        self,
+        session: requests.Session,
+        method: str,
+        url: str,
+        retry: bool,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """
+        Sends a request using `session`. If `retry` is set, the request is
+        retried (up to `max_retries` times) when it fails with a connection
+        error, a timeout or an overloaded server response. The last response
+        is returned even if its status is an error; the last exception is
+        raised if every attempt raised.
+        """
+        kwargs.setdefault("timeout", self._timeout_seconds)
+        attempt = 0
+        while True:
+            self._limiter.acquire()
+            start = time.monotonic()
+            succeeded = False
+            try:
+                response = session.request(method, url, **kwargs)
+                succeeded = response.status_code not in RETRYABLE_STATUS_CODES
+            except (requests.ConnectionError, requests.Timeout):
+                if not retry or attempt >= self._max_retries:
+                    raise
+                response = None
+            finally:
+                latency = time.monotonic() - start
+                self._limiter.release(
+                    succeeded
+                    and (
+                        self._target_latency_seconds is None
+                        or latency <= self._target_latency_seconds
+                    )
+                )
+
+            if succeeded or not retry or attempt >= self._max_retries:
+                assert response is not None
+                return response
+            self._sleep(self._backoff_delay(attempt, response))
+            attempt += 1
+
+    def _backoff_delay(
+        self, attempt: int, response: Optional[requests.Response]
+    ) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), self._backoff_max_seconds)
+        # "Full jitter" backoff.
+        return random.uniform(
+            0,
+            min(self._backoff_max_seconds, self._backoff_base_seconds * 2**attempt),
+        )
+
+
+class _ConcurrencyLimiter:
+    def __init__(self, max_concurrency: int) -> None:
+        if max_concurrency < 1:
+            raise ValueError("The maximum concurrency must be at least 1.")
+        self._max_limit = float(max_concurrency)
+        self._limit = float(max_concurrency)
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        with self._condition:
+            return int(self._limit)
+
+    def acquire(self) -> None:
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self, healthy: bool) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            if healthy:
+                self._limit = min(self._max_limit, self._limit + 1.0 / self._limit)
+            else:
+                self._limit = max(1.0, self._limit / 2)
+            self._condition.notify_all()